@@ -0,0 +1,76 @@
+"""Measure log line classification throughput in lines/s.
+
+Compares the compiled rule table with the separate substring checks the
+viewer and error detection used before, on synthetic onedrive output.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_classifier
+    python -m benchmarks.bench_classifier --lines 1000000
+"""
+
+import argparse
+import random
+import time
+
+from drivux.classifier import get_classifier
+
+SAMPLES = (
+    "Downloading file Documents/report.docx ... done",
+    "Uploading new file Pictures/img_0042.jpg ... done",
+    "Processing 2345 applicable changes and items received from Microsoft OneDrive",
+    "Fetching /delta response from the OneDrive API for Drive ID: b!7r2xYz",
+    "Sync with Microsoft OneDrive is complete",
+    "ERROR: Cannot connect to Microsoft OneDrive Service - Network Connection Issue",
+    "WARNING: The following configuration option has been deprecated: sync_business_shared_folders",
+)
+
+
+def legacy(line: str) -> tuple[str, bool]:
+    """Colour and error test as separate scans, as before the classifier."""
+    lower = line.lower()
+    if "error" in lower or "cannot connect" in lower:
+        color = "error"
+    elif "warning" in lower or "deprec" in lower:
+        color = "warning"
+    elif "downloading" in lower:
+        color = "download"
+    elif "sync with microsoft onedrive is complete" in lower:
+        color = "complete"
+    else:
+        color = ""
+    lower = line.lower()
+    return color, "error" in lower or "cannot connect" in lower or "big_delete" in lower
+
+
+def measure(fn, lines: list[str], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    lines = [f"Oct 18 12:00:00 host onedrive[1234]: {rng.choice(SAMPLES)} {i}" for i in range(args.lines)]
+    folded = [line.casefold() for line in lines]
+    classifier = get_classifier()
+
+    for label, fn, data in (
+        ("legacy checks", legacy, lines),
+        ("classify", classifier.classify, lines),
+        ("classify_folded", classifier.classify_folded, folded),
+    ):
+        print(f"{label:<16} {measure(fn, data, args.rounds):>12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare journal read throughput: sd-journal (ctypes) vs journalctl -o json.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_journal onedrive onedrive-work
+    python -m benchmarks.bench_journal --system onedrive   # system journal (root, containers)
+"""
+
+import argparse
+import subprocess
+import time
+
+from drivux import sd_journal
+from drivux.journal import entry_from_fields, parse_entry
+
+
+def bench_native(services: list[str], system: bool) -> tuple[int, float]:
+    flags = sd_journal.SD_JOURNAL_LOCAL_ONLY
+    flags |= sd_journal.SD_JOURNAL_SYSTEM if system else sd_journal.SD_JOURNAL_CURRENT_USER
+    wanted = set(services)
+    start = time.perf_counter()
+    with sd_journal.SdJournal(services, flags) as reader:
+        reader.seek_tail(10**9)
+        count = sum(1 for f in reader.entries() if entry_from_fields(f, wanted))
+    return count, time.perf_counter() - start
+
+
+def bench_subprocess(services: list[str], system: bool) -> tuple[int, float]:
+    args = ["journalctl", "-o", "json", "--no-pager", "-q"]
+    if not system:
+        args.append("--user")
+    for name in services:
+        args += [f"USER_UNIT={name}.service", "+", f"_SYSTEMD_USER_UNIT={name}.service", "+"]
+    args.pop()
+    wanted = set(services)
+    start = time.perf_counter()
+    out = subprocess.run(args, capture_output=True).stdout
+    count = sum(1 for raw in out.splitlines() if parse_entry(raw, wanted))
+    return count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("services", nargs="+", help="service names without .service")
+    parser.add_argument("--system", action="store_true", help="read the system journal")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if not sd_journal.available():
+        print("libsystemd not available, only the journalctl path can run")
+
+    for label, bench in (("sd-journal", bench_native), ("journalctl", bench_subprocess)):
+        if label == "sd-journal" and not sd_journal.available():
+            continue
+        best = min((bench(args.services, args.system) for _ in range(args.rounds)),
+                   key=lambda r: r[1])
+        count, elapsed = best
+        rate = count / elapsed if elapsed else 0
+        print(f"{label:<11} {count:>9} entries  {elapsed:7.3f} s  {rate:>12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure log archive search latency over months of synthetic logs.
+
+Builds a throwaway archive (not the user's) with --days of onedrive
+output at --per-day entries a day, then times typical searches.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_log_archive
+    python -m benchmarks.bench_log_archive --days 180 --per-day 20000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from drivux.log_archive import LogArchive
+
+SERVICES = ("onedrive", "onedrive-work", "onedrive-sharepoint")
+SAMPLES = (
+    "Downloading file Documents/report_{n}.docx ... done",
+    "Uploading new file Pictures/img_{n}.jpg ... done",
+    "Processing {n} applicable changes and items received from Microsoft OneDrive",
+    "Fetching /delta response from the OneDrive API for Drive ID: b!{n}",
+    "Sync with Microsoft OneDrive is complete",
+    "Skipping item - excluded by skip_dir config: node_modules/{n}",
+)
+RARE = (
+    "ERROR: Cannot connect to Microsoft OneDrive Service - Network Connection Issue",
+    "ERROR: big_delete protection triggered, {n} items would be deleted",
+)
+
+
+def populate(archive: LogArchive, days: int, per_day: int) -> float:
+    rng = random.Random(0)
+    end = time.time()
+    start = end - days * 86400
+    step = (end - start) / (days * per_day)
+    with archive._connect() as db:
+        for day in range(days):
+            rows = []
+            for i in range(per_day):
+                ts = start + (day * per_day + i) * step
+                template = rng.choice(RARE) if rng.random() < 0.001 else rng.choice(SAMPLES)
+                line = f"{time.strftime('%b %d %H:%M:%S', time.localtime(ts))} host onedrive[1]: " + \
+                    template.format(n=rng.randrange(100000))
+                rows.append((rng.choice(SERVICES), ts, line))
+            db.executemany("INSERT INTO entries (service, timestamp, line) VALUES (?, ?, ?)", rows)
+            db.commit()
+    return end
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-day", type=int, default=30000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = LogArchive(list(SERVICES), Path(tmp) / "logs.db")
+        start = time.perf_counter()
+        now = populate(archive, args.days, args.per_day)
+        total = args.days * args.per_day
+        print(f"archived {total:,} entries in {time.perf_counter() - start:.1f} s")
+
+        day, week = 86400, now - 7 * 86400
+        searches = (
+            ("latest, no text", {}),
+            ("common term", {"text": "downloading"}),
+            ("rare term", {"text": "big_delete"}),
+            ("phrase", {"text": '"cannot connect"'}),
+            ("prefix", {"text": "report_12*"}),
+            ("term + service", {"text": "error", "service_names": ["onedrive-work"]}),
+            ("term + last week", {"text": "error", "since": week}),
+            ("service + last week", {"service_names": ["onedrive"], "since": week}),
+            ("term, a day 2 months ago", {"text": "downloading", "since": now - 61 * day, "until": now - 60 * day}),
+            ("term, 6 weeks, 6 weeks ago", {"text": "downloading", "since": now - 89 * day, "until": now - 45 * day}),
+            ("no match", {"text": "nonexistentterm"}),
+        )
+        for label, kwargs in searches:
+            best = float("inf")
+            for _ in range(args.rounds):
+                t0 = time.perf_counter()
+                found = archive.search(**kwargs)
+                best = min(best, time.perf_counter() - t0)
+            print(f"{label:<27} {len(found):>5} rows  {best * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure how many journal lines per second the log viewer can absorb.
+
+Entries are emitted through a JournalFollower in batches, as a burst of
+journal output would be, and the event loop runs between batches so
+model updates, scrolling and painting are all included.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_log_viewer
+    python -m benchmarks.bench_log_viewer --lines 500000 --batch 50
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from drivux.journal import JournalEntry, JournalFollower  # noqa: E402
+from drivux.log_viewer import LogViewer  # noqa: E402
+
+
+def run(app: QApplication, lines: int, batch: int) -> float:
+    follower = JournalFollower()
+    viewer = LogViewer(follower, ["onedrive"])
+    viewer.resize(900, 400)
+    viewer.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    for first in range(0, lines, batch):
+        follower.entries.emit([
+            JournalEntry("onedrive", 0.0, "m", f"Oct 18 12:00:00 host onedrive[1]: Downloading file {i}")
+            for i in range(first, min(first + batch, lines))
+        ])
+        app.processEvents()
+    # Wait for the last queued lines to reach the view
+    while viewer._pending:
+        app.processEvents()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    viewer.close()
+    viewer.deleteLater()
+    return lines / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000, help="entries per emitted batch")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    best = max(run(app, args.lines, args.batch) for _ in range(args.rounds))
+    print(f"{args.lines} lines in batches of {args.batch}: {best:>12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
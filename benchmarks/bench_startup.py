@@ -0,0 +1,59 @@
+"""Measure drivux time-to-tray and fail when it exceeds the budget.
+
+Starts `python -m drivux.main --profile-startup` several times, waits for
+the first status to be published, then stops it. Needs at least one
+onedrive user service. Run from the repository root:
+
+    python -m benchmarks.bench_startup
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_startup --rounds 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Time from process start to the tray icon being shown; do not regress
+TIME_TO_TRAY_BUDGET_MS = 300.0
+
+
+def run_once(timeout: float) -> tuple[float, str]:
+    """Time to tray (ms) and the phase breakdown of one start."""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "drivux.main", "--profile-startup"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    lines = []
+    try:
+        for line in proc.stdout:
+            lines.append(line.rstrip())
+            if line.startswith("time to tray:"):
+                return float(line.split(":")[1].split()[0]), "\n".join(lines)
+        raise RuntimeError("drivux exited before its first status: " + " / ".join(lines))
+    finally:
+        proc.kill()
+        proc.wait(timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=TIME_TO_TRAY_BUDGET_MS)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    times = []
+    for i in range(args.rounds):
+        elapsed, breakdown = run_once(args.timeout)
+        times.append(elapsed)
+        if i == 0:
+            print(breakdown)
+    median = statistics.median(times)
+    print(f"time to tray over {args.rounds} runs: median {median:.1f} ms, "
+          f"min {min(times):.1f} ms, max {max(times):.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
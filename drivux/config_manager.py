@@ -1,7 +1,13 @@
 """Read and write OneDrive configuration files."""
 
+import os
+import stat
+import tempfile
+import threading
 from pathlib import Path
 
+from PySide6.QtCore import QCoreApplication, QFileSystemWatcher, QObject, Signal
+
 # Known config keys with descriptions
 CONFIG_KEYS = {
     "sync_dir": "Local directory to sync",
@@ -24,6 +30,240 @@ CONFIG_KEYS = {
 }
 
 
+# Process umask, for the mode of configs created from scratch (mkstemp
+# itself always creates 0600); read once, os.umask() can only swap it
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def _parse_line(line: str) -> tuple[str, str] | None:
+    """(key, value) of a setting line, None for blanks, comments and junk."""
+    line = line.strip()
+    if not line or line.startswith("#") or "=" not in line:
+        return None
+    key, value = line.split("=", 1)
+    return key.strip(), value.strip().strip('"')
+
+
+def parse_entries(text: str) -> list[tuple[str, str]]:
+    """Settings of a config file in order, repeated keys (skip_dir...) included."""
+    return [entry for entry in map(_parse_line, text.splitlines()) if entry]
+
+
+def _file_key(path: str) -> tuple[int, int, int] | None:
+    """What identifies a version of a file: mtime, inode and size."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_ino, st.st_size
+
+
+class ConfigCache(QObject):
+    """Parsed config files shared by the whole process, keyed by path.
+
+    A cached entry is reused while the file's mtime, inode and size are
+    unchanged. Once a QFileSystemWatcher covers the file and its
+    directory (set up on the GUI thread when an event loop exists), the
+    entry is reused without even a stat() until a change notification
+    drops it, so polling does no config I/O. Safe to read from any
+    thread.
+    """
+    _watch_requested = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        # path -> (file key, parsed entries, covered by the watcher)
+        self._entries: dict[str, tuple[tuple | None, list[tuple[str, str]], bool]] = {}
+        self._watcher: QFileSystemWatcher | None = None
+        self._watch_requested.connect(self._watch)
+
+    def read(self, path: Path) -> list[tuple[str, str]]:
+        """Parsed entries at `path`, empty if missing. Do not modify the result."""
+        name = str(path)
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry and entry[2]:
+            return entry[1]
+        key = _file_key(name)
+        if entry and entry[0] == key:
+            config = entry[1]
+        else:
+            try:
+                config = parse_entries(path.read_text()) if key else []
+            except OSError:
+                key, config = None, []
+        with self._lock:
+            self._entries[name] = (key, config, False)
+        if QCoreApplication.instance() is not None:
+            self._watch_requested.emit(name)  # queued to the GUI thread
+        return config
+
+    def invalidate(self, path: Path) -> None:
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+    def _watch(self, name: str):
+        if self._watcher is None:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._on_file_changed)
+            self._watcher.directoryChanged.connect(self._on_directory_changed)
+        directory = os.path.dirname(name)
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [p for p in (name, directory) if p not in watched and os.path.exists(p)]
+        if missing:
+            self._watcher.addPaths(missing)
+        # The directory catches a file being created or replaced by rename
+        if directory not in self._watcher.directories():
+            return
+        key = _file_key(name)
+        if key is not None and name not in self._watcher.files():
+            return
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry and entry[0] == key:
+                self._entries[name] = (key, entry[1], True)
+
+    def _on_file_changed(self, name: str):
+        self.invalidate(Path(name))
+        # Re-watched on the next read, which also follows a replaced inode
+        self._watcher.removePath(name)
+
+    def _on_directory_changed(self, directory: str):
+        # Other files come and go next to onedrive's config (its database),
+        # only drop the entries whose file did change
+        with self._lock:
+            names = [n for n in self._entries if os.path.dirname(n) == directory]
+        for name in names:
+            with self._lock:
+                entry = self._entries.get(name)
+            if entry and _file_key(name) != entry[0]:
+                self._on_file_changed(name)
+
+
+_cache = ConfigCache()
+
+
+class ConfigTransaction:
+    """Batched set/remove operations, applied in one atomic write.
+
+    Operations are recorded and replayed on the file as it is at commit
+    time. Comments, ordering, unknown lines and the exact text of every
+    untouched setting are preserved; repeated keys keep all their values.
+    Used as a context manager, it commits when the block exits cleanly.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._ops: list[tuple[str, str, list[str]]] = []
+        self.changed = False
+
+    def set(self, key: str, value: str | list[str]) -> None:
+        """Give `key` one value, or a list of values for repeated keys."""
+        self._ops.append(("set", key, [value] if isinstance(value, str) else list(value)))
+
+    def add(self, key: str, value: str) -> None:
+        """Add one more value to a repeated key."""
+        self._ops.append(("add", key, [value]))
+
+    def remove(self, key: str) -> None:
+        """Remove every line of `key`."""
+        self._ops.append(("set", key, []))
+
+    def commit(self) -> bool:
+        """Write the file if its content changed; returns whether it did."""
+        try:
+            # Untranslated, so that CRLF lines survive
+            with open(self.path, newline="") as f:
+                original = f.read()
+        except FileNotFoundError:
+            original = ""
+        lines = original.splitlines(keepends=True)
+        newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+        for op, key, values in self._ops:
+            lines = _apply(lines, op, key, values, newline)
+        self._ops.clear()
+        text = "".join(lines)
+        self.changed = text != original
+        if self.changed:
+            write_atomic(self.path, text)
+            _cache.invalidate(self.path)
+        return self.changed
+
+    def __enter__(self) -> "ConfigTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+
+
+def _setting_line(key: str, value: str, newline: str = "\n") -> str:
+    return f'{key} = "{value}"{newline}'
+
+
+def _apply(lines: list[str], op: str, key: str, values: list[str],
+           newline: str = "\n") -> list[str]:
+    """Lines with the values of `key` replaced ("set") or extended ("add").
+
+    Added lines end with `newline`, the file's own line ending.
+    """
+    positions = [i for i, line in enumerate(lines) if (_parse_line(line) or ("",))[0] == key]
+    if op == "add":
+        keep, values = positions, values
+    else:
+        # Rewrite existing lines in place, keeping those already right as is
+        keep = positions[:len(values)]
+        lines = lines[:]
+        for i, value in zip(keep, values):
+            if _parse_line(lines[i])[1] != value:
+                ending = lines[i][len(lines[i].rstrip("\r\n")):]
+                lines[i] = _setting_line(key, value, "") + ending
+        values = values[len(keep):]
+        lines = [line for i, line in enumerate(lines) if i not in positions[len(keep):]]
+    if not values:
+        return lines
+    # Extra values go after the last line of the key, or at the end
+    at = keep[-1] + 1 if keep else len(lines)
+    if at and not lines[at - 1].endswith("\n"):
+        lines[at - 1] += newline
+    return lines[:at] + [_setting_line(key, value, newline) for value in values] + lines[at:]
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace a file's content so readers only ever see the old or new file.
+
+    A symlinked config (dotfiles repo...) keeps its link, the file it
+    points to is the one replaced.
+    """
+    path = Path(os.path.realpath(path))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            f.write(text)
+            f.flush()
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK  # what open() would have created
+            os.fchmod(f.fileno(), mode)
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Make the rename itself durable
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
 class ConfigManager:
     """Read/write onedrive config files."""
 
@@ -31,59 +271,44 @@ class ConfigManager:
         self.path = config_path
 
     def read(self) -> dict[str, str]:
-        """Parse config file into key-value dict."""
-        config = {}
-        if not self.path.exists():
-            return config
-        for line in self.path.read_text().splitlines():
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" in line:
-                key, value = line.split("=", 1)
-                config[key.strip()] = value.strip().strip('"')
+        """Parse config file into key-value dict, the last of repeated keys winning.
+
+        Cached, see ConfigCache.
+        """
+        return dict(_cache.read(self.path))
+
+    def read_all(self) -> dict[str, list[str]]:
+        """Every value of every key, in file order."""
+        config: dict[str, list[str]] = {}
+        for key, value in _cache.read(self.path):
+            config.setdefault(key, []).append(value)
         return config
 
-    def write(self, config: dict[str, str]) -> None:
-        """Write config dict back to file, preserving comments."""
-        lines = []
-        if self.path.exists():
-            existing = self.path.read_text().splitlines()
-        else:
-            existing = []
-
-        written_keys = set()
-        for line in existing:
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                lines.append(line)
-                continue
-            if "=" in stripped:
-                key = stripped.split("=", 1)[0].strip()
-                if key in config:
-                    lines.append(f'{key} = "{config[key]}"')
-                    written_keys.add(key)
-                # Skip keys removed from config
-                continue
-            lines.append(line)
-
-        # Add new keys
-        for key, value in config.items():
-            if key not in written_keys:
-                lines.append(f'{key} = "{value}"')
-
-        self.path.write_text("\n".join(lines) + "\n")
+    def transaction(self) -> ConfigTransaction:
+        return ConfigTransaction(self.path)
+
+    def write(self, config: dict[str, str | list[str]]) -> bool:
+        """Make the file hold exactly `config`, preserving comments and order.
+
+        Returns whether the file changed.
+        """
+        with self.transaction() as tx:
+            for key in self.read_all().keys() - config.keys():
+                tx.remove(key)
+            for key, value in config.items():
+                tx.set(key, value)
+        return tx.changed
 
     def get(self, key: str, default: str = "") -> str:
         config = self.read()
         return config.get(key, default)
 
-    def set(self, key: str, value: str) -> None:
-        config = self.read()
-        config[key] = value
-        self.write(config)
+    def set(self, key: str, value: str | list[str]) -> bool:
+        with self.transaction() as tx:
+            tx.set(key, value)
+        return tx.changed
 
-    def remove(self, key: str) -> None:
-        config = self.read()
-        config.pop(key, None)
-        self.write(config)
+    def remove(self, key: str) -> bool:
+        with self.transaction() as tx:
+            tx.remove(key)
+        return tx.changed
@@ -0,0 +1,111 @@
+"""Incremental journal error detection for onedrive services."""
+
+import threading
+import time
+from collections import deque
+
+from .classifier import get_classifier
+from .journal import JournalEntry, read_entries
+
+ERROR_WINDOW_MINUTES = 10
+
+
+class ErrorTracker:
+    """Sliding-window error counter fed from the journal by cursor.
+
+    The first update of a unit reads the whole window, later ones only
+    the entries written after the last cursor, so the steady-state cost
+    follows the new log volume instead of the window size. While the
+    shared journal follower is live, entries arrive through feed() and
+    update() only primes each unit once.
+    """
+
+    def __init__(self, window_minutes: int = ERROR_WINDOW_MINUTES):
+        self._window = window_minutes * 60
+        self._lock = threading.Lock()
+        self._cursors: dict[str, str] = {}
+        self._errors: dict[str, deque[tuple[float, str]]] = {}
+        self._last_seen: dict[str, float] = {}  # newest journal timestamp read, once primed
+        self._live = False
+
+    def set_live(self, live: bool) -> None:
+        """Switch between follower-fed (live) and cursor-polling modes."""
+        with self._lock:
+            if self._live and not live:
+                # The cursors predate what the follower fed, resuming from
+                # them would count those errors again: re-read the window
+                self._cursors.clear()
+            self._live = live
+
+    def feed(self, entries: list[JournalEntry]) -> set[str]:
+        """Record a batch of entries from the journal follower.
+
+        Returns the services that got new errors.
+        """
+        is_error = get_classifier().is_error
+        services = set()
+        with self._lock:
+            for entry in entries:
+                last_seen = self._last_seen.get(entry.service)
+                if last_seen is not None:
+                    if entry.timestamp <= last_seen:
+                        continue  # already read by the priming read
+                    self._last_seen[entry.service] = entry.timestamp
+                if is_error(entry.line):
+                    self._errors.setdefault(entry.service, deque()).append(
+                        (entry.timestamp, entry.line)
+                    )
+                    services.add(entry.service)
+        return services
+
+    def update(self, service_name: str) -> None:
+        """Read new journal entries of a unit and record its errors."""
+        with self._lock:
+            if self._live and service_name in self._last_seen:
+                return
+            cursor = self._cursors.get(service_name)
+        entries, ok = self._read(service_name, cursor)
+        if not ok and cursor:
+            # Cursor no longer valid (journal rotated or vacuumed)
+            cursor = None
+            entries, ok = self._read(service_name, None)
+        fresh = cursor is None
+
+        is_error = get_classifier().is_error
+        new_errors = [(e.timestamp, e.line) for e in entries if is_error(e.line)]
+        if entries and entries[-1].cursor:
+            cursor = entries[-1].cursor
+
+        with self._lock:
+            if cursor:
+                self._cursors[service_name] = cursor
+            if fresh:
+                # A full window read replaces whatever was counted before
+                self._errors[service_name] = deque()
+            errors = self._errors.setdefault(service_name, deque())
+            errors.extend(new_errors)
+            if entries or service_name not in self._last_seen:
+                self._last_seen[service_name] = max(
+                    [e.timestamp for e in entries[-1:]] + [self._last_seen.get(service_name, 0.0)]
+                )
+            self._prune(errors, time.time() - self._window)
+
+    def recent(self, service_name: str, minutes: float = ERROR_WINDOW_MINUTES) -> list[str]:
+        """Errors of a unit seen in the last `minutes` (at most the window)."""
+        since = time.time() - min(minutes * 60, self._window)
+        with self._lock:
+            errors = self._errors.get(service_name)
+            if not errors:
+                return []
+            self._prune(errors, time.time() - self._window)
+            return [text for ts, text in errors if ts >= since]
+
+    def _read(self, service_name: str, cursor: str | None) -> tuple[list[JournalEntry], bool]:
+        if cursor:
+            return read_entries([service_name], cursor=cursor)
+        return read_entries([service_name], since=time.time() - self._window)
+
+    @staticmethod
+    def _prune(errors: deque, since: float) -> None:
+        while errors and errors[0][0] < since:
+            errors.popleft()
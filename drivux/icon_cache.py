@@ -0,0 +1,110 @@
+"""Tray icons rasterized once per size and pixel ratio, with status badges."""
+
+from pathlib import Path
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QFont, QGuiApplication, QIcon, QPainter, QPixmap
+
+ICONS_DIR = Path(__file__).parent / "resources" / "icons"
+CACHE_DIR = Path.home() / ".cache" / "drivux" / "icons"
+
+# Logical sizes offered to the tray, which picks the closest to its slot
+ICON_SIZES = (16, 22, 24, 32, 48, 64)
+BADGE_COLOR = "#e64553"
+
+
+class IconCache:
+    """Tray icons of the ok/error/syncing states, optionally badged.
+
+    Each SVG is rendered once per logical size and device pixel ratio
+    into a PNG under CACHE_DIR, re-rendered only when the SVG is newer.
+    Later launches load the PNGs and never parse the SVG. Badges (the
+    number of failing services) are painted over the cached pixmaps, and
+    every icon built is kept in memory.
+    """
+
+    def __init__(self, icons_dir: Path = ICONS_DIR, cache_dir: Path = CACHE_DIR):
+        self._icons_dir = icons_dir
+        self._cache_dir = cache_dir
+        self._pixmaps: dict[tuple[str, int, float], QPixmap] = {}
+        self._icons: dict[tuple[str, int], QIcon] = {}
+
+    def icon(self, state: str, badge: int = 0) -> QIcon:
+        """Icon of a state, with `badge` drawn on it when non-zero; null if unknown."""
+        key = (state, badge)
+        if key not in self._icons:
+            icon = QIcon()
+            for ratio in self._pixel_ratios():
+                for size in ICON_SIZES:
+                    pixmap = self.pixmap(state, size, ratio)
+                    if pixmap.isNull():
+                        return QIcon()
+                    icon.addPixmap(draw_badge(pixmap, badge) if badge else pixmap)
+            self._icons[key] = icon
+        return self._icons[key]
+
+    def pixmap(self, state: str, size: int, ratio: float) -> QPixmap:
+        """Base pixmap of a state at a logical size, from memory, disk or the SVG."""
+        key = (state, size, ratio)
+        if key not in self._pixmaps:
+            self._pixmaps[key] = self._load(state, size, ratio)
+        return self._pixmaps[key]
+
+    def _load(self, state: str, size: int, ratio: float) -> QPixmap:
+        svg = self._icons_dir / f"{state}.svg"
+        try:
+            svg_mtime = svg.stat().st_mtime
+        except OSError:
+            return QPixmap()
+        cached = self._cache_dir / f"{state}-{size}@{ratio:g}x.png"
+        try:
+            fresh = cached.stat().st_mtime >= svg_mtime
+        except OSError:
+            fresh = False
+        pixmap = QPixmap()
+        if not (fresh and pixmap.load(str(cached))):
+            pixmap = render_svg(svg, round(size * ratio))
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                pixmap.save(str(cached), "PNG")
+            except OSError:
+                pass  # read-only cache, render again next time
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+
+    @staticmethod
+    def _pixel_ratios() -> list[float]:
+        screens = QGuiApplication.screens()
+        return sorted({screen.devicePixelRatio() for screen in screens}) or [1.0]
+
+
+def render_svg(path: Path, pixels: int) -> QPixmap:
+    from PySide6.QtSvg import QSvgRenderer
+    pixmap = QPixmap(pixels, pixels)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    QSvgRenderer(str(path)).render(painter)
+    painter.end()
+    return pixmap
+
+
+def draw_badge(base: QPixmap, count: int) -> QPixmap:
+    """A copy of `base` with `count` in a disc at its bottom right corner."""
+    pixmap = base.copy()
+    pixmap.setDevicePixelRatio(base.devicePixelRatio())
+    size = base.deviceIndependentSize().width()
+    diameter = size * 0.6
+    rect = QRectF(size - diameter, size - diameter, diameter, diameter)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(BADGE_COLOR))
+    painter.drawEllipse(rect)
+    font = QFont()
+    font.setBold(True)
+    font.setPixelSize(max(1, round(diameter * (0.75 if count < 10 else 0.55))))
+    painter.setFont(font)
+    painter.setPen(QColor("white"))
+    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(count) if count < 10 else "9+")
+    painter.end()
+    return pixmap
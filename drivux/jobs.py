@@ -0,0 +1,148 @@
+"""Start/stop/restart jobs queued to systemd and tracked to completion."""
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .systemd_bus import SystemdBus
+from .tasks import run_command, submit
+
+# systemd waits up to 90 s (DefaultTimeoutStopSec) before killing a unit
+CONTROL_TIMEOUT = 100.0
+
+
+class ControlBatch(QObject):
+    """One action over several units, whose jobs systemd runs concurrently.
+
+    Over D-Bus each unit gets its own job, finished by JobRemoved, so
+    progress is reported unit by unit. Without the bus a single
+    `systemctl <action> unit...` call waits for all jobs at once. Either
+    way the batch takes as long as its slowest unit.
+    """
+    progress = Signal(int, int)  # finished jobs, total
+    finished = Signal(dict)  # service name -> job result ("done", "failed", "timeout"...)
+
+    def __init__(self, action: str, service_names: list[str], bus: SystemdBus, parent=None):
+        super().__init__(parent)
+        self.action = action
+        self.service_names = list(service_names)
+        self.results: dict[str, str] = {}
+        self._jobs: dict[str, str] = {}  # job object path -> service name
+        self._bus = bus
+        self._listening = False
+        self._finished = False
+        self._timeout = QTimer(self)
+        self._timeout.setSingleShot(True)
+        self._timeout.setInterval(int(CONTROL_TIMEOUT * 1000))
+        self._timeout.timeout.connect(self._on_timeout)
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) == len(self.service_names)
+
+    @property
+    def failed(self) -> list[str]:
+        return [name for name, result in self.results.items() if result != "done"]
+
+    def start(self) -> None:
+        self._timeout.start()
+        bus = self._bus
+        if not bus.available:
+            submit(
+                lambda: run_command(
+                    ["systemctl", "--user", self.action,
+                     *[f"{name}.service" for name in self.service_names]],
+                    timeout=CONTROL_TIMEOUT,
+                ),
+                on_done=self._on_command_done,
+                on_error=lambda message: self._finish_all("failed"),
+            )
+            self._report()
+            return
+        bus.job_removed.connect(self._on_job_removed)
+        self._listening = True
+        for name in self.service_names:
+            job = bus.queue_job(self.action, name)
+            if job:
+                self._jobs[job] = name
+            else:
+                self.results[name] = "failed"
+        self._report()
+
+    def _on_job_removed(self, job: str, result: str):
+        name = self._jobs.pop(job, None)
+        if name is not None:
+            self.results[name] = result
+            self._report()
+
+    def _on_command_done(self, result):
+        self._finish_all("done" if result.returncode == 0 else "failed")
+
+    def _on_timeout(self):
+        self._finish_all("timeout")
+
+    def _finish_all(self, result: str):
+        # The command may still come back after the timeout gave up on it
+        if self._finished:
+            return
+        for name in self.service_names:
+            self.results.setdefault(name, result)
+        self._report()
+
+    def _report(self):
+        if self._finished:
+            return
+        self.progress.emit(len(self.results), len(self.service_names))
+        if not self.done:
+            return
+        self._finished = True
+        self._timeout.stop()
+        if self._listening:
+            self._bus.job_removed.disconnect(self._on_job_removed)
+            self._listening = False
+        self.finished.emit(dict(self.results))
+
+
+class JobTracker(QObject):
+    """Starts control operations and sums the progress of those running.
+
+    An operation is a ControlBatch or anything shaped like one: `results`
+    and `service_names`, a start() method, and progress and finished
+    signals (see RollingRestart).
+    """
+    progress = Signal(int, int)  # finished jobs, total; (0, 0) once all are done
+
+    def __init__(self, bus: SystemdBus, parent=None):
+        super().__init__(parent)
+        self._bus = bus
+        self._operations: list[QObject] = []
+
+    def submit(self, action: str, service_names: list[str], track: bool = True) -> ControlBatch:
+        """Queue a job per unit; see start()."""
+        return self.start(ControlBatch(action, service_names, self._bus, self), track)
+
+    def start(self, operation, track: bool = True):
+        """Start an operation on the next event loop turn.
+
+        Deferring the start lets callers connect to its signals even when
+        it finishes right away. Its progress is counted if `track`.
+        """
+        operation.setParent(self)
+        operation.finished.connect(lambda _: self._remove(operation))
+        if track:
+            operation.progress.connect(self._report)
+            self._operations.append(operation)
+        QTimer.singleShot(0, operation.start)
+        return operation
+
+    def _remove(self, operation):
+        operation.deleteLater()
+        if operation in self._operations:
+            self._operations.remove(operation)
+            self._report()
+
+    def _report(self):
+        if not self._operations:
+            self.progress.emit(0, 0)
+            return
+        done = sum(len(op.results) for op in self._operations)
+        total = sum(len(op.service_names) for op in self._operations)
+        self.progress.emit(done, total)
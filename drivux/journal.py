@@ -0,0 +1,256 @@
+"""Single journalctl follower shared by every onedrive service."""
+
+import itertools
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+from PySide6.QtCore import QObject, QProcess, QSocketNotifier, QTimer, Signal
+
+from . import sd_journal
+from .tasks import run_command
+
+BACKLOG_LINES = 200  # per service, shown when the log viewer switches unit
+RESTART_DELAY_MS = 5000
+
+# User units log under _SYSTEMD_USER_UNIT, _SYSTEMD_UNIT is user@UID.service;
+# USER_UNIT is set on systemd's own "Started/Stopped" messages about the unit.
+UNIT_FIELDS = ("_SYSTEMD_USER_UNIT", "USER_UNIT", "_SYSTEMD_UNIT")
+
+
+@dataclass
+class JournalEntry:
+    service: str
+    timestamp: float
+    message: str
+    line: str
+    cursor: str = ""
+
+
+def _field_text(value) -> str:
+    # Non UTF-8 fields come as a list of byte values in journalctl's JSON
+    if isinstance(value, list):
+        return bytes(value).decode("utf-8", errors="replace")
+    return "" if value is None else str(value)
+
+
+@lru_cache(maxsize=256)
+def _short_time(second: int) -> str:
+    # Like journalctl's short format; bursts share the same second
+    return time.strftime("%b %d %H:%M:%S", time.localtime(second))
+
+
+def entry_from_fields(fields: dict, services: set[str]) -> JournalEntry | None:
+    """Build an entry from journal fields if it belongs to a known service."""
+    service = ""
+    for key in UNIT_FIELDS:
+        unit = fields.get(key, "")
+        if unit.endswith(".service") and unit[:-8] in services:
+            service = unit[:-8]
+            break
+    if not service:
+        return None
+
+    timestamp = int(fields.get("__REALTIME_TIMESTAMP", 0)) / 1_000_000
+    message = _field_text(fields.get("MESSAGE"))
+    ident = fields.get("SYSLOG_IDENTIFIER", service)
+    pid = fields.get("_PID")
+    prefix = f"{ident}[{pid}]" if pid else ident
+    line = f"{_short_time(int(timestamp))} {fields.get('_HOSTNAME', '')} {prefix}: {message}"
+    return JournalEntry(service, timestamp, message, line, fields.get("__CURSOR", ""))
+
+
+def parse_entry(data: bytes | str, services: set[str]) -> JournalEntry | None:
+    """Turn one `journalctl -o json` line into an entry for a known service."""
+    try:
+        fields = json.loads(data)
+    except ValueError:
+        return None
+    return entry_from_fields(fields, services)
+
+
+def read_entries(service_names: list[str], cursor: str = "", since: float = 0.0,
+                 lines: int = 0, limit: int = 0,
+                 until: float = 0.0) -> tuple[list[JournalEntry], bool]:
+    """Read journal entries once, natively when libsystemd is available.
+
+    Starts after `cursor`, else at the `since` timestamp, else `lines`
+    entries before the end, and stops after `limit` entries if set.
+    `until` only bounds the journalctl fallback, which reads its whole
+    range before `limit` applies; the native reader stops at `limit`.
+    Returns the entries and whether the read succeeded (an unknown
+    cursor fails).
+    """
+    services = set(service_names)
+    if sd_journal.available():
+        try:
+            with sd_journal.SdJournal(service_names) as reader:
+                if cursor:
+                    reader.seek_cursor(cursor)
+                elif since:
+                    reader.seek_realtime(since)
+                else:
+                    reader.seek_tail(lines)
+                found = (e for e in (entry_from_fields(f, services) for f in reader.entries()) if e)
+                entries = list(itertools.islice(found, limit or None))
+                if entries:
+                    entries[-1].cursor = reader.cursor()
+                return entries, True
+        except OSError:
+            if cursor:
+                return [], False
+
+    args = ["journalctl", "--user", "-o", "json", "--no-pager", "-q"]
+    for name in service_names:
+        args += ["-u", f"{name}.service"]
+    if cursor:
+        args += ["--after-cursor", cursor]
+    elif since:
+        args += ["--since", f"@{since:.6f}"]
+    else:
+        args += ["-n", str(lines)]
+    if until:
+        args += ["--until", f"@{until:.6f}"]
+    result = run_command(args)
+    entries = [e for e in (parse_entry(raw, services) for raw in result.stdout.splitlines()) if e]
+    if limit:
+        entries = entries[:limit]
+    return entries, result.returncode == 0
+
+
+class JournalFollower(QObject):
+    """One journal reader covering all services.
+
+    Reads the journal natively through sd-journal (woken by its inotify
+    fd) when libsystemd is available, otherwise runs a single
+    `journalctl -o json -f` process. Entries are parsed once and
+    demultiplexed by unit; the log viewer, error detection and anything
+    else subscribe to `entries`, emitted once per read with every entry
+    it returned.
+    """
+    entries = Signal(list)
+    running_changed = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._process: QProcess | None = None
+        self._reader: sd_journal.SdJournal | None = None
+        self._notifier: QSocketNotifier | None = None
+        self._services: set[str] = set()
+        self._history: dict[str, deque[str]] = {}
+        self._partial = b""
+        self._cursor = ""
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        if self._reader is not None:
+            return True
+        return self._process is not None and self._process.state() != QProcess.NotRunning
+
+    def start(self, service_names: list[str]) -> None:
+        self.stop()
+        self._stopping = False
+        self._services = set(service_names)
+        for name in service_names:
+            self._history.setdefault(name, deque(maxlen=BACKLOG_LINES))
+        if not service_names:
+            return
+        if sd_journal.available() and self._start_native(service_names):
+            return
+
+        args = ["--user", "-o", "json", "-f", "--no-pager", "-q"]
+        for name in service_names:
+            args += ["-u", f"{name}.service"]
+        if self._cursor:
+            # Restarted after a crash, resume where we stopped
+            args += ["--after-cursor", self._cursor]
+        else:
+            args += ["-n", str(BACKLOG_LINES * len(service_names))]
+
+        self._partial = b""
+        self._process = QProcess(self)
+        self._process.readyReadStandardOutput.connect(self._on_output)
+        self._process.started.connect(lambda: self.running_changed.emit(True))
+        self._process.finished.connect(self._on_finished)
+        self._process.start("journalctl", args)
+
+    def _start_native(self, service_names: list[str]) -> bool:
+        try:
+            self._reader = sd_journal.SdJournal(service_names)
+            self._reader.seek_tail(BACKLOG_LINES * len(service_names))
+            fd = self._reader.fileno()
+        except OSError:
+            self._close_reader()
+            return False
+        self._notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._on_journal_changed)
+        self._drain()
+        self.running_changed.emit(True)
+        return True
+
+    def _close_reader(self):
+        if self._notifier:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+
+    def stop(self):
+        self._stopping = True
+        if self._reader:
+            self._close_reader()
+            self.running_changed.emit(False)
+        if self._process and self._process.state() != QProcess.NotRunning:
+            self._process.kill()
+            self._process.waitForFinished(1000)
+        if self._process:
+            self._process.deleteLater()
+        self._process = None
+
+    def history(self, service_name: str) -> list[str]:
+        """Recent lines of a service, oldest first."""
+        return list(self._history.get(service_name, ()))
+
+    def _on_journal_changed(self):
+        if self._reader and self._reader.process() != sd_journal.SD_JOURNAL_NOP:
+            self._drain()
+
+    def _drain(self):
+        batch = []
+        for fields in self._reader.entries():
+            entry = entry_from_fields(fields, self._services)
+            if entry is not None:
+                self._history[entry.service].append(entry.line)
+                batch.append(entry)
+        if batch:
+            self.entries.emit(batch)
+
+    def _on_output(self):
+        if not self._process:
+            return
+        data = self._partial + self._process.readAllStandardOutput().data()
+        *lines, self._partial = data.split(b"\n")
+        batch = []
+        for raw in lines:
+            entry = parse_entry(raw, self._services)
+            if entry is None:
+                continue
+            self._history[entry.service].append(entry.line)
+            batch.append(entry)
+        if batch:
+            self._cursor = batch[-1].cursor or self._cursor
+            self.entries.emit(batch)
+
+    def _on_finished(self):
+        self.running_changed.emit(False)
+        if not self._stopping:
+            QTimer.singleShot(RESTART_DELAY_MS, self._restart)
+
+    def _restart(self):
+        if not self._stopping and not self.running:
+            self.start(sorted(self._services))
@@ -0,0 +1,238 @@
+"""Local full-text archive of onedrive journal entries (SQLite FTS5)."""
+
+import os
+import shlex
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QTimer
+
+from . import sd_journal
+from .journal import read_entries
+from .preferences import get_int
+from .tasks import Task, current_task, submit
+
+# Kept out of ~/.local/share/drivux, which install.sh owns as a git checkout
+STATE_DIR = Path(os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state")
+ARCHIVE_PATH = STATE_DIR / "drivux" / "logs.db"
+INGEST_INTERVAL_MS = 60000
+INGEST_BATCH = 20000  # entries read and committed at once
+SEARCH_LIMIT = 1000  # newest matches returned by a search
+# journalctl reads a whole --since range before anything can be sliced
+# off, so without libsystemd backfills go one window at a time
+FALLBACK_WINDOW = 6 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    service TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_service_time ON entries (service, timestamp);
+CREATE INDEX IF NOT EXISTS entries_time ON entries (timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+    line, content='entries', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, line) VALUES (new.id, new.line);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, line) VALUES ('delete', old.id, old.line);
+END;
+-- Range of ids inserted for each hour of timestamps, to turn a time
+-- window into a rowid range the FTS index can seek to
+CREATE TABLE IF NOT EXISTS hours (
+    hour INTEGER PRIMARY KEY,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entries_hours AFTER INSERT ON entries BEGIN
+    INSERT INTO hours VALUES (CAST(new.timestamp / 3600 AS INTEGER), new.id, new.id)
+    ON CONFLICT (hour) DO UPDATE SET
+        first_id = MIN(first_id, excluded.first_id), last_id = MAX(last_id, excluded.last_id);
+END;
+CREATE TABLE IF NOT EXISTS cursors (
+    service TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class ArchivedEntry:
+    service: str
+    timestamp: float
+    line: str
+
+
+def fts_query(text: str) -> str:
+    """FTS5 query matching lines that contain every term of `text`.
+
+    Terms are quoted so punctuation is never FTS syntax; "quoted phrases"
+    stay together and a trailing * makes a term a prefix.
+    """
+    try:
+        terms = shlex.split(text)
+    except ValueError:  # unbalanced quote while typing
+        terms = text.split()
+    parts = []
+    for term in terms:
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            parts.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+class LogArchive(QObject):
+    """Copies new journal entries into SQLite, by cursor, once a minute.
+
+    Entries older than the `log_archive_days` preference are dropped
+    after each ingest; 0 disables the archive. Ingests and searches run
+    on the thread pool, each with its own connection.
+    """
+
+    def __init__(self, service_names: list[str], path: Path = ARCHIVE_PATH, parent=None):
+        super().__init__(parent)
+        self._services = list(service_names)
+        self._path = path
+        self._retention_days = get_int("log_archive_days")
+        self._ingest_task: Task | None = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.ingest)
+
+    @property
+    def enabled(self) -> bool:
+        return self._retention_days > 0
+
+    def start(self, interval_ms: int = INGEST_INTERVAL_MS) -> None:
+        if not self.enabled:
+            return
+        self.ingest()
+        self._timer.start(interval_ms)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        if self._ingest_task:
+            self._ingest_task.cancel()
+
+    def ingest(self) -> None:
+        """Archive new entries in the background (skipped if one is running)."""
+        if self._ingest_task is None:
+            self._ingest_task = submit(self.ingest_now, on_done=self._on_ingested,
+                                       on_error=self._on_ingested)
+
+    def _on_ingested(self, _):
+        self._ingest_task = None
+
+    def ingest_now(self) -> int:
+        """Archive new entries of every service; returns how many were added."""
+        task = current_task()
+        added = 0
+        with self._connect() as db:
+            for name in self._services:
+                added += self._ingest_service(db, name, task)
+                if task and task.cancelled:
+                    break
+            oldest = self._oldest()
+            db.execute("DELETE FROM entries WHERE timestamp < ?", (oldest,))
+            db.execute("DELETE FROM hours WHERE hour < ?", (int(oldest // 3600),))
+        return added
+
+    def _ingest_service(self, db: sqlite3.Connection, name: str, task: Task | None) -> int:
+        row = db.execute("SELECT cursor FROM cursors WHERE service = ?", (name,)).fetchone()
+        cursor = row[0] if row else ""
+        since = self._resume_time(db, name)
+        windowed = not sd_journal.available()
+        added = 0
+        while not (task and task.cancelled):
+            until = since + FALLBACK_WINDOW if windowed else 0.0
+            if until >= time.time():
+                until = 0.0
+            entries, ok = read_entries([name], cursor=cursor, since=since,
+                                       limit=INGEST_BATCH, until=until)
+            if not ok and cursor:
+                # Cursor no longer valid (journal rotated or vacuumed)
+                cursor = ""
+                since = self._resume_time(db, name)
+                continue
+            db.executemany(
+                "INSERT INTO entries (service, timestamp, line) VALUES (?, ?, ?)",
+                [(e.service, e.timestamp, e.line) for e in entries],
+            )
+            if entries and entries[-1].cursor:
+                cursor = entries[-1].cursor
+                db.execute("INSERT OR REPLACE INTO cursors VALUES (?, ?)", (name, cursor))
+            db.commit()
+            added += len(entries)
+            if len(entries) < INGEST_BATCH:
+                if not until:
+                    break
+                since = until
+        return added
+
+    def _resume_time(self, db: sqlite3.Connection, name: str) -> float:
+        # Without a cursor, start after the newest archived entry
+        row = db.execute("SELECT MAX(timestamp) FROM entries WHERE service = ?", (name,)).fetchone()
+        if row[0] is not None:
+            return row[0] + 1e-6
+        return self._oldest()
+
+    def _oldest(self) -> float:
+        return time.time() - self._retention_days * 86400
+
+    def search(self, text: str = "", service_names: list[str] | None = None,
+               since: float = 0.0, until: float = 0.0,
+               limit: int = SEARCH_LIMIT) -> list[ArchivedEntry]:
+        """Newest archived entries matching the filters, oldest first."""
+        where = ["e.timestamp >= ?"]
+        params: list = [since]
+        if until:
+            where.append("e.timestamp <= ?")
+            params.append(until)
+        if service_names:
+            where.append(f"e.service IN ({', '.join('?' * len(service_names))})")
+            params += service_names
+        query = fts_query(text)
+        with self._connect() as db:
+            if not query:
+                sql = ("SELECT e.service, e.timestamp, e.line FROM entries e "
+                       f"WHERE {' AND '.join(where)} ORDER BY e.timestamp DESC LIMIT ?")
+                rows = db.execute(sql, [*params, limit]).fetchall()
+                return [ArchivedEntry(*row) for row in reversed(rows)]
+
+            # Matches are walked newest first by rowid so LIMIT stops early;
+            # bounding the rowids to the window skips matches outside it
+            if since or until:
+                low, high = db.execute(
+                    "SELECT MIN(first_id), MAX(last_id) FROM hours WHERE hour BETWEEN ? AND ?",
+                    (int(since // 3600), int((until or time.time()) // 3600)),
+                ).fetchone()
+                if low is None:
+                    return []
+                where.append("f.rowid BETWEEN ? AND ?")
+                params += [low, high]
+            sql = ("SELECT e.service, e.timestamp, e.line FROM entries_fts f "
+                   "JOIN entries e ON e.id = f.rowid "
+                   f"WHERE entries_fts MATCH ? AND {' AND '.join(where)} "
+                   "ORDER BY f.rowid DESC LIMIT ?")
+            rows = db.execute(sql, [query, *params, limit]).fetchall()
+        return [ArchivedEntry(*row) for row in reversed(rows)]
+
+    @contextmanager
+    def _connect(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self._path, timeout=30)
+        try:
+            # WAL lets searches read while an ingest is writing
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            yield db
+            db.commit()
+        finally:
+            db.close()
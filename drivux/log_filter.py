@@ -0,0 +1,83 @@
+"""Log filter queries, matched against casefolded copies of the lines."""
+
+import re
+import shlex
+
+from .tasks import current_task
+
+CANCEL_CHECK_EVERY = 4096  # lines scanned between cancellation checks
+
+
+def fold(line: str) -> str:
+    """Casefolded copy of a line, sharing the string when nothing changes."""
+    folded = line.casefold()
+    return line if folded == line else folded
+
+
+class LogFilter:
+    """A parsed filter query.
+
+    Plain queries are whitespace-separated terms that must all appear,
+    "quoted phrases" count as one term and a leading "-" excludes a term.
+    Regex queries are searched case-insensitively in the original line.
+    Raises re.error for an invalid regex.
+    """
+
+    def __init__(self, text: str, regex: bool = False):
+        self.text = text
+        self.regex = regex
+        self._pattern = re.compile(text, re.IGNORECASE) if regex else None
+        self._include: list[str] = []
+        self._exclude: list[str] = []
+        if not regex:
+            try:
+                terms = shlex.split(text)
+            except ValueError:  # unbalanced quote while typing
+                terms = text.split()
+            for term in terms:
+                if term.startswith("-") and len(term) > 1:
+                    self._exclude.append(fold(term[1:]))
+                else:
+                    self._include.append(fold(term))
+
+    @property
+    def empty(self) -> bool:
+        return not (self._pattern or self._include or self._exclude)
+
+    def matches(self, line: str, folded: str) -> bool:
+        if self._pattern is not None:
+            return self._pattern.search(line) is not None
+        return all(term in folded for term in self._include) and \
+            not any(term in folded for term in self._exclude)
+
+    def narrows(self, other: "LogFilter | None") -> bool:
+        """Whether every line matching self also matches `other`.
+
+        When true, self only needs to be checked against other's matches.
+        """
+        if other is None or self.regex or other.regex or other.empty:
+            return False
+        return all(any(old in new for new in self._include) for old in other._include) and \
+            set(other._exclude) <= set(self._exclude)
+
+    def scan(self, first_seq: int, lines: list[str], folded: list[str],
+             candidates: list[int] | None = None) -> list[int]:
+        """Sequence numbers of the matching lines, lines[0] being `first_seq`.
+
+        Only `candidates` are checked when given. Meant to run on a worker
+        thread: gives up early when the calling task is cancelled.
+        """
+        task = current_task()
+        rows = range(len(lines)) if candidates is None else \
+            [seq - first_seq for seq in candidates if seq >= first_seq]
+        result = []
+        single = self._include[0] if len(self._include) == 1 and not self._exclude else None
+        for start in range(0, len(rows), CANCEL_CHECK_EVERY):
+            if task and task.cancelled:
+                return []
+            chunk = rows[start:start + CANCEL_CHECK_EVERY]
+            if single is not None:
+                result.extend(first_seq + i for i in chunk if single in folded[i])
+            else:
+                result.extend(first_seq + i for i in chunk if self.matches(lines[i], folded[i]))
+        return result
@@ -0,0 +1,97 @@
+"""Search dialog over the local log archive."""
+
+import time
+
+from PySide6.QtCore import QDateTime
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QDateTimeEdit,
+    QLabel, QLineEdit, QPushButton,
+)
+
+from .log_archive import LogArchive, ArchivedEntry, SEARCH_LIMIT
+from .log_viewer import LogModel, create_log_view
+from .tasks import Task, submit
+from .i18n import t
+
+
+class LogSearchDialog(QDialog):
+    """Search archived logs by service, time range and text."""
+
+    def __init__(self, archive: LogArchive, service_names: list[str],
+                 service: str | None = None, parent=None):
+        super().__init__(parent)
+        self._archive = archive
+        self._service_names = service_names
+        self._task: Task | None = None
+        self._model = LogModel(SEARCH_LIMIT, self)
+        self.setWindowTitle(t("log_history"))
+        self.resize(1000, 600)
+        self._setup_ui(service)
+        self._search()
+
+    def _setup_ui(self, service: str | None):
+        layout = QVBoxLayout(self)
+
+        toolbar = QHBoxLayout()
+        self._combo = QComboBox()
+        self._combo.addItem(t("all_services"), None)
+        for name in self._service_names:
+            label = name.replace("onedrive-", "").replace("onedrive", t("personal"))
+            self._combo.addItem(label, name)
+        if service in self._service_names:
+            self._combo.setCurrentIndex(self._service_names.index(service) + 1)
+        toolbar.addWidget(self._combo)
+
+        now = QDateTime.currentDateTime()
+        self._since = QDateTimeEdit(now.addDays(-1))
+        self._until = QDateTimeEdit(now)
+        for label, edit in ((t("from"), self._since), (t("to"), self._until)):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+            toolbar.addWidget(QLabel(f"{label}:"))
+            toolbar.addWidget(edit)
+
+        self._text = QLineEdit()
+        self._text.setPlaceholderText(t("filter_placeholder"))
+        self._text.returnPressed.connect(self._search)
+        toolbar.addWidget(self._text, 1)
+
+        btn_search = QPushButton(t("search"))
+        btn_search.setDefault(True)
+        btn_search.clicked.connect(self._search)
+        toolbar.addWidget(btn_search)
+        layout.addLayout(toolbar)
+
+        self._view = create_log_view(self._model)
+        layout.addWidget(self._view)
+
+        self._status = QLabel()
+        layout.addWidget(self._status)
+
+    def _search(self):
+        if self._task:
+            self._task.cancel()
+        service = self._combo.currentData()
+        services = [service] if service else None
+        since = self._since.dateTime().toSecsSinceEpoch()
+        until = self._until.dateTime().toSecsSinceEpoch() + 59  # whole last minute
+        started = time.perf_counter()
+        self._task = task = submit(
+            self._archive.search, self._text.text(), services, since, until,
+            on_done=lambda entries: self._show_results(task, entries, service, started),
+            on_error=lambda message: self._status.setText(message),
+        )
+
+    def _show_results(self, task: Task, entries: list[ArchivedEntry],
+                      service: str | None, started: float):
+        if task is not self._task:
+            return  # superseded by a newer search
+        self._task = None
+        self._model.clear()
+        if service:
+            self._model.append_lines([e.line for e in entries])
+        else:
+            self._model.append_lines([f"[{e.service}] {e.line}" for e in entries])
+        self._view.scrollToBottom()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._status.setText(f"{len(entries)} {t('results')} - {elapsed_ms:.0f} ms")
@@ -1,59 +1,253 @@
-"""Live log viewer widget using journalctl --follow."""
+"""Live log viewer widget fed by the shared journal follower."""
 
-import subprocess
+import re
 
-from PySide6.QtCore import QProcess, Signal, QObject
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
-    QComboBox, QLabel, QPushButton, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QStyledItemDelegate,
+    QComboBox, QLabel, QPushButton, QLineEdit, QApplication, QAbstractItemView, QToolButton,
 )
-from PySide6.QtGui import QTextCharFormat, QColor, QFont
+from PySide6.QtGui import QColor, QFont, QKeySequence, QPalette, QShortcut
 
+from .classifier import Severity, get_classifier
+from .journal import JournalEntry, JournalFollower
+from .log_archive import LogArchive
+from .log_filter import LogFilter, fold
+from .preferences import get_int
+from .proc import rss_bytes
+from .ring_buffer import RingBuffer
+from .tasks import Task, submit
 from .i18n import t
 
+MEMORY_READOUT_MS = 2000
+FLUSH_INTERVAL_MS = 33  # ~30 fps, lines arriving in between are appended together
+FILTER_DELAY_MS = 200  # typing pause before the filter runs
 
-class LogStream(QObject):
-    """Streams journalctl output for a service."""
-    new_line = Signal(str)
-    error = Signal(str)
+COLOR_ERROR = QColor("#f38ba8")  # Red
+COLOR_WARNING = QColor("#fab387")  # Orange
+COLOR_DOWNLOAD = QColor("#89b4fa")  # Blue
+COLOR_COMPLETE = QColor("#a6e3a1")  # Green
+COLOR_DEFAULT = QColor("#cdd6f4")
 
-    def __init__(self, parent=None):
+SEVERITY_COLORS = {Severity.ERROR: COLOR_ERROR, Severity.WARNING: COLOR_WARNING}
+CATEGORY_COLORS = {"download": COLOR_DOWNLOAD, "complete": COLOR_COMPLETE}
+
+
+def line_color(line: str) -> QColor:
+    result = get_classifier().classify(line)
+    return SEVERITY_COLORS.get(result.severity) or CATEGORY_COLORS.get(result.category, COLOR_DEFAULT)
+
+
+class LogModel(QAbstractListModel):
+    """Log lines kept in a ring buffer, optionally narrowed by a filter.
+
+    Lines are addressed by a running sequence number so the filtered
+    rows stay valid while the oldest lines fall out of the buffer.
+    """
+
+    def __init__(self, max_lines: int, parent=None):
         super().__init__(parent)
-        self._process: QProcess | None = None
-
-    def start(self, service_name: str):
-        self.stop()
-        self._process = QProcess(self)
-        self._process.setProcessChannelMode(QProcess.MergedChannels)
-        self._process.readyReadStandardOutput.connect(self._on_output)
-        self._process.start("journalctl", [
-            "--user", "-u", f"{service_name}.service",
-            "-f", "--no-pager", "-q", "-n", "200",
-        ])
-
-    def stop(self):
-        if self._process and self._process.state() != QProcess.NotRunning:
-            self._process.kill()
-            self._process.waitForFinished(1000)
-            self._process = None
-
-    def _on_output(self):
-        if self._process:
-            data = self._process.readAllStandardOutput().data().decode("utf-8", errors="replace")
-            for line in data.splitlines():
-                if line.strip():
-                    self.new_line.emit(line)
+        self._lines = RingBuffer(max_lines)
+        self._folded = RingBuffer(max_lines)  # casefolded lines, for filtering
+        self._first_seq = 0  # sequence number of self._lines[0]
+        self._filter: LogFilter | None = None
+        self._matches: RingBuffer | None = None  # sequence numbers, when filtering
+
+    @property
+    def total(self) -> int:
+        """Retained lines, filtered or not."""
+        return len(self._lines)
+
+    @property
+    def capacity(self) -> int:
+        return self._lines.capacity
+
+    @property
+    def log_filter(self) -> LogFilter | None:
+        return self._filter
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._matches) if self._matches is not None else len(self._lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self.line(index.row())
+        return None
+
+    def line(self, row: int) -> str:
+        if self._matches is not None:
+            return self._lines[self._matches[row] - self._first_seq]
+        return self._lines[row]
+
+    def append_lines(self, lines: list[str]) -> None:
+        """Append lines, dropping the oldest ones beyond capacity."""
+        lines = lines[-self._lines.capacity:]
+        if not lines:
+            return
+        overflow = max(0, len(self._lines) + len(lines) - self._lines.capacity)
+        if overflow:
+            self._drop_oldest(overflow)
+
+        next_seq = self._first_seq + len(self._lines)
+        folded = [fold(line) for line in lines]
+        if self._matches is None:
+            first = len(self._lines)
+            self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+            self._extend(lines, folded)
+            self.endInsertRows()
+            return
+
+        matching = [next_seq + i for i in range(len(lines)) if self._filter.matches(lines[i], folded[i])]
+        self._extend(lines, folded)
+        if matching:
+            first = len(self._matches)
+            self.beginInsertRows(QModelIndex(), first, first + len(matching) - 1)
+            for seq in matching:
+                self._matches.append(seq)
+            self.endInsertRows()
+
+    def snapshot(self) -> tuple[int, list[str], list[str]]:
+        """First sequence number, lines and casefolded lines, for LogFilter.scan()."""
+        return self._first_seq, self._lines.to_list(), self._folded.to_list()
+
+    def matched_seqs(self) -> list[int]:
+        return self._matches.to_list() if self._matches is not None else []
+
+    def set_filter(self, log_filter: LogFilter | None,
+                   seqs: list[int] | None = None, scanned_until: int = 0) -> None:
+        """Show only the lines matching log_filter (all lines if None).
+
+        `seqs` are matches computed from a snapshot() ending before
+        `scanned_until`: lines dropped since are skipped and lines appended
+        since are matched here. Without them every line is scanned.
+        """
+        self.beginResetModel()
+        if log_filter is None or log_filter.empty:
+            self._filter = None
+            self._matches = None
+        else:
+            self._filter = log_filter
+            if seqs is None:
+                seqs, scanned_until = [], self._first_seq
+            end = self._first_seq + len(self._lines)
+            start = max(scanned_until, self._first_seq)
+            self._matches = RingBuffer(self._lines.capacity)
+            for seq in seqs:
+                if seq >= self._first_seq:
+                    self._matches.append(seq)
+            for seq in range(start, end):
+                i = seq - self._first_seq
+                if log_filter.matches(self._lines[i], self._folded[i]):
+                    self._matches.append(seq)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._lines.clear()
+        self._folded.clear()
+        self._first_seq = 0
+        if self._matches is not None:
+            self._matches.clear()
+        self.endResetModel()
+
+    def _extend(self, lines: list[str], folded: list[str]) -> None:
+        for line, folded_line in zip(lines, folded):
+            self._lines.append(line)
+            self._folded.append(folded_line)
+
+    def _drop_oldest(self, count: int) -> None:
+        if self._matches is None:
+            self.beginRemoveRows(QModelIndex(), 0, count - 1)
+            for _ in range(count):
+                self._lines.popleft()
+                self._folded.popleft()
+            self._first_seq += count
+            self.endRemoveRows()
+            return
+
+        limit = self._first_seq + count
+        removed = 0
+        while removed < len(self._matches) and self._matches[removed] < limit:
+            removed += 1
+        if removed:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            for _ in range(removed):
+                self._matches.popleft()
+        for _ in range(count):
+            self._lines.popleft()
+            self._folded.popleft()
+        self._first_seq = limit
+        if removed:
+            self.endRemoveRows()
+
+
+class LogLineDelegate(QStyledItemDelegate):
+    """Colours each line at paint time, so only visible rows are classified."""
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.palette.setColor(QPalette.ColorRole.Text, line_color(option.text))
+
+
+def create_log_view(model: LogModel) -> QTableView:
+    """Read-only view over a LogModel, with Ctrl+C copying the selected lines."""
+    # A single-column table with fixed row heights, so only visible rows
+    # are laid out and painted. (QListView with uniform item sizes still
+    # relayouts every row on each insert.)
+    view = QTableView()
+    view.setModel(model)
+    view.setItemDelegate(LogLineDelegate(view))
+    view.setFont(QFont("Monospace", 9))
+    view.horizontalHeader().hide()
+    view.horizontalHeader().setStretchLastSection(True)
+    rows = view.verticalHeader()
+    rows.hide()
+    rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    rows.setDefaultSectionSize(view.fontMetrics().height() + 2)
+    view.setShowGrid(False)
+    view.setWordWrap(False)
+    view.setTextElideMode(Qt.TextElideMode.ElideRight)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+    view.setStyleSheet("QTableView { background-color: #1e1e2e; color: #cdd6f4; }")
+
+    def copy_selection():
+        selected = sorted(index.row() for index in view.selectedIndexes())
+        if selected:
+            QApplication.clipboard().setText("\n".join(model.line(r) for r in selected))
+
+    QShortcut(QKeySequence.StandardKey.Copy, view, copy_selection)
+    return view
 
 
 class LogViewer(QWidget):
     """Widget displaying live logs with filtering."""
 
-    def __init__(self, service_names: list[str], parent=None):
+    def __init__(self, journal: JournalFollower, service_names: list[str],
+                 archive: LogArchive | None = None, parent=None):
         super().__init__(parent)
         self._service_names = service_names
-        self._stream = LogStream(self)
-        self._stream.new_line.connect(self._append_line)
+        self._journal = journal
+        self._archive = archive
+        self._service: str | None = None
+        self._model = LogModel(max(100, get_int("log_max_lines")), self)
+        self._pending: list[str] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._start_filter)
+        self._filter_task: Task | None = None
+        self._wanted_filter: LogFilter | None = None
         self._setup_ui()
+        self._journal.entries.connect(self._on_entries)
 
         if service_names:
             self._on_service_changed(0)
@@ -76,69 +270,119 @@ class LogViewer(QWidget):
         toolbar.addWidget(QLabel(f"{t('filter')}:"))
         self._filter = QLineEdit()
         self._filter.setPlaceholderText(t("filter_placeholder"))
-        self._filter.textChanged.connect(self._apply_filter)
+        self._filter.textChanged.connect(self._filter_timer.start)
         toolbar.addWidget(self._filter, 1)
 
+        self._regex = QToolButton()
+        self._regex.setText(".*")
+        self._regex.setToolTip(t("filter_regex"))
+        self._regex.setCheckable(True)
+        self._regex.toggled.connect(self._filter_timer.start)
+        toolbar.addWidget(self._regex)
+
         self._btn_clear = QPushButton(t("clear"))
         self._btn_clear.clicked.connect(self._clear_logs)
         toolbar.addWidget(self._btn_clear)
 
+        if self._archive is not None and self._archive.enabled:
+            btn_history = QPushButton(t("history"))
+            btn_history.setToolTip(t("log_history"))
+            btn_history.clicked.connect(self._open_history)
+            toolbar.addWidget(btn_history)
+
         layout.addLayout(toolbar)
 
-        # Log area
-        self._log_area = QTextEdit()
-        self._log_area.setReadOnly(True)
-        self._log_area.setFont(QFont("Monospace", 9))
-        self._log_area.setStyleSheet(
-            "QTextEdit { background-color: #1e1e2e; color: #cdd6f4; }"
-        )
-        layout.addWidget(self._log_area)
+        self._log_view = create_log_view(self._model)
+        layout.addWidget(self._log_view)
 
-        self._all_lines: list[str] = []
+        # Line count and memory readout, to check RSS stays flat
+        self._memory_label = QLabel()
+        layout.addWidget(self._memory_label)
+        self._memory_timer = QTimer(self)
+        self._memory_timer.timeout.connect(self._update_memory_readout)
+        self._memory_timer.start(MEMORY_READOUT_MS)
 
     def _on_service_changed(self, index: int):
-        self._all_lines.clear()
-        self._log_area.clear()
-        service = self._combo.itemData(index)
-        if service:
-            self._stream.start(service)
-
-    def _append_line(self, line: str):
-        self._all_lines.append(line)
-        filter_text = self._filter.text().lower()
-        if not filter_text or filter_text in line.lower():
-            self._colorize_and_append(line)
-
-    def _colorize_and_append(self, line: str):
-        cursor = self._log_area.textCursor()
-        fmt = QTextCharFormat()
-
-        lower = line.lower()
-        if "error" in lower or "cannot connect" in lower:
-            fmt.setForeground(QColor("#f38ba8"))  # Red
-        elif "warning" in lower or "deprec" in lower:
-            fmt.setForeground(QColor("#fab387"))  # Orange
-        elif "downloading" in lower:
-            fmt.setForeground(QColor("#89b4fa"))  # Blue
-        elif "sync with microsoft onedrive is complete" in lower:
-            fmt.setForeground(QColor("#a6e3a1"))  # Green
-        else:
-            fmt.setForeground(QColor("#cdd6f4"))  # Default
+        self._pending.clear()
+        self._model.clear()
+        self._service = self._combo.itemData(index)
+        if self._service:
+            self._model.append_lines(self._journal.history(self._service))
+        self._restart_filter()
 
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.insertText(line + "\n", fmt)
-        self._log_area.ensureCursorVisible()
+    def _on_entries(self, entries: list[JournalEntry]):
+        lines = [e.line for e in entries if e.service == self._service]
+        if lines:
+            self._pending.extend(lines)
+            if not self._flush_timer.isActive():
+                self._flush_timer.start()
 
-    def _apply_filter(self, text: str):
-        self._log_area.clear()
-        filter_text = text.lower()
-        for line in self._all_lines:
-            if not filter_text or filter_text in line.lower():
-                self._colorize_and_append(line)
+    def _flush(self):
+        """Append everything received since the last frame in one model edit."""
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        # Keep following the tail only if the user has not scrolled up
+        bar = self._log_view.verticalScrollBar()
+        follow = bar.value() >= bar.maximum()
+        self._model.append_lines(lines)
+        if follow:
+            self._log_view.scrollToBottom()
 
-    def _clear_logs(self):
-        self._all_lines.clear()
-        self._log_area.clear()
+    def _start_filter(self):
+        """Scan the retained lines for the filter on the thread pool."""
+        if self._filter_task:
+            self._filter_task.cancel()
+            self._filter_task = None
+        try:
+            log_filter = LogFilter(self._filter.text(), self._regex.isChecked())
+        except re.error as e:
+            self._filter.setStyleSheet("color: #f38ba8;")
+            self._filter.setToolTip(str(e))
+            return
+        self._filter.setStyleSheet("")
+        self._filter.setToolTip("")
+        self._wanted_filter = log_filter
+        if log_filter.empty:
+            self._model.set_filter(None)
+            self._log_view.scrollToBottom()
+            return
+
+        first_seq, lines, folded = self._model.snapshot()
+        # Refining the query only needs to look at the current matches
+        candidates = self._model.matched_seqs() if log_filter.narrows(self._model.log_filter) else None
+        scanned_until = first_seq + len(lines)
+        self._filter_task = submit(
+            log_filter.scan, first_seq, lines, folded, candidates,
+            on_done=lambda seqs: self._on_filter_done(log_filter, seqs, scanned_until),
+        )
+
+    def _on_filter_done(self, log_filter: LogFilter, seqs: list[int], scanned_until: int):
+        if log_filter is not self._wanted_filter:
+            return  # superseded while running
+        self._filter_task = None
+        self._model.set_filter(log_filter, seqs, scanned_until)
+        self._log_view.scrollToBottom()
 
-    def cleanup(self):
-        self._stream.stop()
+    def _restart_filter(self):
+        """Rerun a scan whose snapshot no longer matches the model."""
+        if self._filter_task:
+            self._start_filter()
+
+    def _update_memory_readout(self):
+        if not self.isVisible():
+            return
+        rss_mb = rss_bytes() / (1024 * 1024)
+        self._memory_label.setText(
+            f"{self._model.total}/{self._model.capacity} {t('lines')} - {t('memory')}: {rss_mb:.0f} MB"
+        )
+
+    def _open_history(self):
+        from .log_search import LogSearchDialog  # imports this module
+        dialog = LogSearchDialog(self._archive, self._service_names, self._service, self)
+        dialog.show()
+
+    def _clear_logs(self):
+        self._pending.clear()
+        self._model.clear()
+        self._restart_filter()
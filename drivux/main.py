@@ -1,21 +1,58 @@
 """Drivux - OneDrive Linux GUI Manager."""
 
 import sys
+import time
 
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QFont, QAction
-from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QStyle
-from PySide6.QtSvg import QSvgRenderer
+_IMPORTS_STARTED = time.perf_counter()
+
+import argparse
+from typing import TYPE_CHECKING
 
-from pathlib import Path
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QIcon, QAction
+from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QStyle
 
 from . import __version__, __app_name__
-from .service_manager import ServiceManager
-from .main_window import MainWindow
+from .icon_cache import IconCache
+from .proc import process_age
+from .service_manager import ServiceManager, ServiceStatus
+from .service_table import activity_sparkline
+from .tasks import cancel_all
 from .i18n import t
 
+# The window and its log viewer load on first use
+if TYPE_CHECKING:
+    from .main_window import MainWindow
+    from .rolling_restart import RollingRestart
+
+
+class StartupProfile:
+    """Wall-clock time of each startup phase, for --profile-startup."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._marks: list[tuple[str, float]] = []
+        # Interpreter startup, before this module began importing Qt
+        self._python = process_age() - (time.perf_counter() - _IMPORTS_STARTED)
 
-ICONS_DIR = Path(__file__).parent / "resources" / "icons"
+    def mark(self, phase: str) -> None:
+        """Record the end of a phase."""
+        if self.enabled:
+            self._marks.append((phase, time.perf_counter()))
+
+    def elapsed(self, phase: str) -> float:
+        """Seconds from process start to the end of a phase."""
+        at = dict(self._marks)[phase]
+        return self._python + at - _IMPORTS_STARTED
+
+    def report(self) -> str:
+        lines = [f"{'python':<16}{self._python * 1000:8.1f} ms  (process start, approximate)"]
+        previous = _IMPORTS_STARTED
+        for phase, at in self._marks:
+            lines.append(f"{phase:<16}{(at - previous) * 1000:8.1f} ms  "
+                         f"{self.elapsed(phase) * 1000:8.1f} ms total")
+            previous = at
+        return "\n".join(lines)
 
 
 class DrivuxTray(QSystemTrayIcon):
@@ -25,37 +62,23 @@ class DrivuxTray(QSystemTrayIcon):
         super().__init__()
         self._service_mgr = service_mgr
         self._app = app
-        self._main_window: MainWindow | None = None
-
-        self._icons = {
-            "ok": self._load_icon("ok.svg"),
-            "error": self._load_icon("error.svg"),
-            "syncing": self._load_icon("syncing.svg"),
-        }
+        self._main_window: "MainWindow | None" = None
+        self._icon_cache = IconCache()
 
-        self.setIcon(self._icons.get("ok", self.style_icon()))
+        self.setIcon(self._icon("ok"))
         self.setToolTip(f"{__app_name__} v{__version__}")
 
         self._build_menu()
         self.activated.connect(self._on_activated)
 
-        # Status check timer
-        self._timer = QTimer()
-        self._timer.timeout.connect(self._update_status)
-        self._timer.start(15000)  # 15s
-        self._update_status()
-
-    def _load_icon(self, name: str) -> QIcon:
-        path = ICONS_DIR / name
-        if path.exists():
-            renderer = QSvgRenderer(str(path))
-            pixmap = QPixmap(64, 64)
-            pixmap.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(pixmap)
-            renderer.render(painter)
-            painter.end()
-            return QIcon(pixmap)
-        return self.style_icon()
+        # Shared status store, polled once ServiceManager.start_monitoring() runs
+        self._store = self._service_mgr.store
+        self._store.updated.connect(self._update_status)
+
+    def _icon(self, state: str, failing: int = 0) -> QIcon:
+        """Cached tray icon of a state, badged with the number of failing services."""
+        icon = self._icon_cache.icon(state, failing)
+        return self.style_icon() if icon.isNull() else icon
 
     def style_icon(self) -> QIcon:
         return QApplication.style().standardIcon(QStyle.StandardPixmap.SP_DriveNetIcon)
@@ -86,9 +109,8 @@ class DrivuxTray(QSystemTrayIcon):
 
         self.setContextMenu(menu)
 
-    def _update_status(self):
-        statuses = self._service_mgr.get_all_statuses()
-        has_error = False
+    def _update_status(self, statuses: list[ServiceStatus]):
+        failing = 0
 
         for i, st in enumerate(statuses):
             if i >= len(self._status_actions):
@@ -97,22 +119,29 @@ class DrivuxTray(QSystemTrayIcon):
 
             if not st.active:
                 self._status_actions[i].setText(f"  {label}: {t('stopped')}")
-                has_error = True
+                failing += 1
             else:
-                errors = self._service_mgr.has_recent_errors(st.name)
+                errors = self._store.cached_errors(st.name)
                 if errors:
                     self._status_actions[i].setText(f"  {label}: {t('error').upper()}")
-                    has_error = True
+                    failing += 1
                 else:
                     self._status_actions[i].setText(f"  {label}: {t('ok')}")
 
-        # Update tray icon
-        if has_error:
-            self.setIcon(self._icons.get("error", self.style_icon()))
-            self.setToolTip(f"{__app_name__} - {t('error_detected')}")
+        # Update tray icon, with each service's last hour of activity
+        now = time.time()
+        activity = "".join(
+            f"\n{st.name.replace('onedrive-', '').replace('onedrive', t('personal'))}: "
+            f"{activity_sparkline(self._service_mgr.sync.metrics(st.name), now)}"
+            for st in statuses
+        )
+        if failing:
+            self.setIcon(self._icon("error", failing))
+            self.setToolTip(f"{__app_name__} - {t('error_detected')}{activity}")
         else:
-            self.setIcon(self._icons.get("ok", self.style_icon()))
-            self.setToolTip(f"{__app_name__} - {t('all_ok')}")
+            syncing = any(self._service_mgr.sync.metrics(st.name).busy(now) for st in statuses)
+            self.setIcon(self._icon("syncing" if syncing else "ok"))
+            self.setToolTip(f"{__app_name__} - {t('all_ok')}{activity}")
 
     def _on_activated(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -120,29 +149,48 @@ class DrivuxTray(QSystemTrayIcon):
 
     def _show_window(self):
         if self._main_window is None:
+            from .main_window import MainWindow
             self._main_window = MainWindow(self._service_mgr)
         self._main_window.show()
         self._main_window.raise_()
         self._main_window.activateWindow()
 
     def _restart_all(self):
-        for svc in self._service_mgr.services:
-            self._service_mgr.restart(svc)
-        self._update_status()
+        rollout = self._service_mgr.restart_rolling(self._service_mgr.services)
+        rollout.finished.connect(lambda _: self._report_restart(rollout))
+
+    def _report_restart(self, rollout: "RollingRestart"):
+        if rollout.failed:
+            message = t("restart_aborted") if rollout.aborted else t("restart_failed")
+            self.showMessage(__app_name__, f"{message}: {', '.join(rollout.failed)}",
+                             QSystemTrayIcon.MessageIcon.Warning)
 
     def _quit(self):
+        self._store.cancel()
+        self._service_mgr.journal.stop()
+        self._service_mgr.archive.stop()
+        cancel_all()
         if self._main_window:
             self._main_window.close()
         self._app.quit()
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(prog="drivux", description=__doc__)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase took")
+    args, qt_args = parser.parse_known_args()
+    profile = StartupProfile(args.profile_startup)
+    profile.mark("imports")
+
+    app = QApplication([sys.argv[0], *qt_args])
     app.setApplicationName(__app_name__)
     app.setApplicationVersion(__version__)
     app.setQuitOnLastWindowClosed(False)
+    profile.mark("qapplication")
 
     service_mgr = ServiceManager()
+    profile.mark("discovery")
 
     if not service_mgr.services:
         print(t("no_service"))
@@ -150,6 +198,22 @@ def main():
 
     tray = DrivuxTray(service_mgr, app)
     tray.show()
+    profile.mark("tray")
+
+    # Probing, journal reading and archiving wait for the tray to be up
+    def start_monitoring():
+        service_mgr.start_monitoring()
+        profile.mark("monitoring")
+
+    QTimer.singleShot(0, start_monitoring)
+    if profile.enabled:
+        def on_first_status():
+            service_mgr.store.updated.disconnect(on_first_status)
+            profile.mark("first status")
+            print(profile.report(), flush=True)
+            print(f"time to tray: {profile.elapsed('tray') * 1000:.1f} ms", flush=True)
+
+        service_mgr.store.updated.connect(on_first_status)
 
     sys.exit(app.exec())
 
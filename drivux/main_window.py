@@ -1,14 +1,14 @@
 """Main window with service overview and live logs."""
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTableWidget, QTableWidgetItem, QPushButton,
-    QHeaderView, QSplitter, QLabel, QMenu,
+    QTableView, QAbstractItemView, QPushButton,
+    QHeaderView, QSplitter, QLabel, QMenu, QProgressBar,
 )
-from PySide6.QtGui import QColor, QIcon, QAction
 
-from .service_manager import ServiceManager
+from .service_manager import ServiceManager, ServiceStatus
+from .service_table import ACTIONS_COLUMN, ServiceActionsDelegate, ServiceTableModel
 from .log_viewer import LogViewer
 from .settings_dialog import SettingsDialog
 from .i18n import t
@@ -20,13 +20,12 @@ class MainWindow(QMainWindow):
     def __init__(self, service_mgr: ServiceManager, parent=None):
         super().__init__(parent)
         self._service_mgr = service_mgr
+        self._store = service_mgr.store
         self.setWindowTitle("Drivux - OneDrive Manager")
         self.setMinimumSize(900, 600)
         self._setup_ui()
-        self._refresh_timer = QTimer(self)
-        self._refresh_timer.timeout.connect(self._refresh_status)
-        self._refresh_timer.start(10000)  # 10s
-        self._refresh_status()
+        self._store.updated.connect(self._on_statuses_updated)
+        service_mgr.jobs.progress.connect(self._on_job_progress)
 
     def _setup_ui(self):
         central = QWidget()
@@ -44,6 +43,12 @@ class MainWindow(QMainWindow):
         header_layout.addWidget(QLabel(f"{t('services')} OneDrive"))
         header_layout.addStretch()
 
+        # Progress of queued start/stop/restart jobs
+        self._progress = QProgressBar()
+        self._progress.setFormat(t("jobs_progress"))
+        self._progress.hide()
+        header_layout.addWidget(self._progress)
+
         btn_refresh = QPushButton(t("refresh"))
         btn_refresh.clicked.connect(self._refresh_status)
         header_layout.addWidget(btn_refresh)
@@ -54,95 +59,59 @@ class MainWindow(QMainWindow):
 
         top_layout.addLayout(header_layout)
 
-        self._table = QTableWidget(0, 5)
-        self._table.setHorizontalHeaderLabels([
-            t("service"), t("status"), t("folder"), t("pid"), t("actions")
-        ])
-        self._table.horizontalHeader().setSectionResizeMode(
-            0, QHeaderView.ResizeMode.Stretch
-        )
-        self._table.horizontalHeader().setSectionResizeMode(
-            2, QHeaderView.ResizeMode.Stretch
-        )
-        self._table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._model = ServiceTableModel(self._store, self._service_mgr.sync, self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
+        actions = ServiceActionsDelegate(self._table)
+        actions.action_triggered.connect(self._on_action)
+        self._table.setItemDelegateForColumn(ACTIONS_COLUMN, actions)
+        header = self._table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        rows = self._table.verticalHeader()
+        rows.hide()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self._table.fontMetrics().height() + 14)  # fits the action buttons
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self._table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self._table.customContextMenuRequested.connect(self._context_menu)
         top_layout.addWidget(self._table)
         splitter.addWidget(top)
 
         # Bottom: log viewer
-        self._log_viewer = LogViewer(self._service_mgr.services)
+        self._log_viewer = LogViewer(
+            self._service_mgr.journal, self._service_mgr.services, self._service_mgr.archive
+        )
         splitter.addWidget(self._log_viewer)
 
         splitter.setSizes([250, 350])
         layout.addWidget(splitter)
 
     def _refresh_status(self):
-        statuses = self._service_mgr.get_all_statuses()
-        self._table.setRowCount(len(statuses))
-
-        for row, st in enumerate(statuses):
-            # Name
-            label = st.display_name or st.name
-            self._table.setItem(row, 0, QTableWidgetItem(label))
-
-            # Status
-            status_item = QTableWidgetItem(t("active") if st.active else t("inactive"))
-            if st.active:
-                errors = self._service_mgr.has_recent_errors(st.name)
-                if errors:
-                    status_item.setText(t("error"))
-                    status_item.setForeground(QColor("#f38ba8"))
-                else:
-                    status_item.setForeground(QColor("#a6e3a1"))
-            else:
-                status_item.setForeground(QColor("#f9e2af"))
-            self._table.setItem(row, 1, status_item)
-
-            # Sync dir
-            self._table.setItem(row, 2, QTableWidgetItem(st.sync_dir))
-
-            # PID
-            self._table.setItem(row, 3, QTableWidgetItem(str(st.pid) if st.pid else "-"))
-
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(4, 2, 4, 2)
-
-            if st.active:
-                btn_restart = QPushButton(t("restart"))
-                btn_restart.setProperty("service", st.name)
-                btn_restart.clicked.connect(self._restart_service)
-                actions_layout.addWidget(btn_restart)
-
-                btn_stop = QPushButton(t("stop"))
-                btn_stop.setProperty("service", st.name)
-                btn_stop.clicked.connect(self._stop_service)
-                actions_layout.addWidget(btn_stop)
-            else:
-                btn_start = QPushButton(t("start"))
-                btn_start.setProperty("service", st.name)
-                btn_start.clicked.connect(self._start_service)
-                actions_layout.addWidget(btn_start)
-
-            self._table.setCellWidget(row, 4, actions_widget)
-
-    def _restart_service(self):
-        name = self.sender().property("service")
-        self._service_mgr.restart(name)
-        self._refresh_status()
+        self._store.refresh()
 
-    def _stop_service(self):
-        name = self.sender().property("service")
-        self._service_mgr.stop(name)
-        self._refresh_status()
+    def _on_statuses_updated(self, statuses: list[ServiceStatus]):
+        if self.isVisible():
+            self._render_statuses(statuses)
 
-    def _start_service(self):
-        name = self.sender().property("service")
-        self._service_mgr.start(name)
-        self._refresh_status()
+    def _render_statuses(self, statuses: list[ServiceStatus]):
+        self._model.set_statuses(statuses)
+
+    def _on_action(self, action: str, row: int):
+        st = self._model.status(row)
+        if st:
+            self._control(action, st.name)
+
+    def _control(self, action: str, name: str):
+        """Queue a start/stop/restart; the store refreshes once it is done."""
+        self._service_mgr.control(action, [name])
+
+    def _on_job_progress(self, done: int, total: int):
+        self._progress.setVisible(total > 0)
+        self._progress.setMaximum(max(total, 1))
+        self._progress.setValue(done)
 
     def _open_settings(self):
         dialog = SettingsDialog(self._service_mgr, self)
@@ -150,29 +119,24 @@ class MainWindow(QMainWindow):
         self._refresh_status()
 
     def _context_menu(self, pos):
-        row = self._table.rowAt(pos.y())
-        if row < 0:
-            return
-        statuses = self._service_mgr.get_all_statuses()
-        if row >= len(statuses):
+        st = self._model.status(self._table.rowAt(pos.y()))
+        if st is None:
             return
-        st = statuses[row]
 
         menu = QMenu(self)
         if st.active:
-            menu.addAction(t("restart"), lambda: (
-                self._service_mgr.restart(st.name), self._refresh_status()
-            ))
-            menu.addAction(t("stop"), lambda: (
-                self._service_mgr.stop(st.name), self._refresh_status()
-            ))
+            menu.addAction(t("restart"), lambda: self._control("restart", st.name))
+            menu.addAction(t("stop"), lambda: self._control("stop", st.name))
         else:
-            menu.addAction(t("start"), lambda: (
-                self._service_mgr.start(st.name), self._refresh_status()
-            ))
+            menu.addAction(t("start"), lambda: self._control("start", st.name))
         menu.exec(self._table.viewport().mapToGlobal(pos))
 
-    def closeEvent(self, event):
-        self._log_viewer.cleanup()
-        self._refresh_timer.stop()
-        event.accept()
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._render_statuses(self._store.snapshot())
+        self._store.set_visible(True)
+        self._store.refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._store.set_visible(False)
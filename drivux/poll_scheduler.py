@@ -0,0 +1,70 @@
+"""Per-service poll intervals that adapt to change, activity and visibility."""
+
+POLL_MIN_SECONDS = 2.0
+POLL_MAX_SECONDS = 300.0
+VISIBLE_POLL_SECONDS = 10.0  # cap while the status table is on screen
+
+
+class PollScheduler:
+    """Decides when each service is probed next.
+
+    A service is polled at the minimum interval right after it changed
+    (state, PID or newest error) or was expedited by a user action, then
+    the interval doubles at each unchanged probe. It is capped at
+    VISIBLE_POLL_SECONDS while the window is visible or the service is
+    syncing, and at the maximum interval otherwise. Times are monotonic
+    seconds; all methods run on the GUI thread.
+    """
+
+    def __init__(self, min_interval: float = POLL_MIN_SECONDS,
+                 max_interval: float = POLL_MAX_SECONDS):
+        self.visible = False
+        self._min = self._max = 0.0
+        self.set_bounds(min_interval, max_interval)
+        self._interval: dict[str, float] = {}
+        self._due: dict[str, float] = {}
+        self._fingerprint: dict[str, tuple] = {}
+
+    def set_bounds(self, min_interval: float, max_interval: float) -> None:
+        self._min = max(1.0, min_interval)
+        self._max = max(self._min, max_interval)
+
+    def set_services(self, service_names: list[str], now: float) -> None:
+        """Track these services; new ones are due immediately."""
+        for name in service_names:
+            if name not in self._due:
+                self._interval[name] = self._min
+                self._due[name] = now
+        for name in set(self._due) - set(service_names):
+            del self._due[name]
+            del self._interval[name]
+            self._fingerprint.pop(name, None)
+
+    def next_due(self) -> float | None:
+        return min(self._due.values(), default=None)
+
+    def due(self, now: float) -> list[str]:
+        """Services to probe now, pushed back by their interval until observed."""
+        names = [name for name, due in self._due.items() if due <= now]
+        for name in names:
+            self._due[name] = now + self._interval[name]
+        return names
+
+    def observe(self, service_name: str, fingerprint: tuple, busy: bool, now: float) -> None:
+        """Reschedule a service from the result of its probe."""
+        if service_name not in self._due:
+            return
+        if fingerprint != self._fingerprint.get(service_name):
+            interval = self._min
+        else:
+            cap = min(VISIBLE_POLL_SECONDS, self._max) if self.visible or busy else self._max
+            interval = max(self._min, min(self._interval[service_name] * 2, cap))
+        self._fingerprint[service_name] = fingerprint
+        self._interval[service_name] = interval
+        self._due[service_name] = now + interval
+
+    def expedite(self, service_name: str, now: float) -> None:
+        """Poll a service at the minimum interval again, e.g. after an action."""
+        if service_name in self._due:
+            self._interval[service_name] = self._min
+            self._due[service_name] = min(self._due[service_name], now + self._min)
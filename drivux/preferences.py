@@ -0,0 +1,25 @@
+"""Drivux's own preferences, stored like onedrive configs."""
+
+from pathlib import Path
+
+from .config_manager import ConfigManager
+
+PREFERENCES_PATH = Path.home() / ".config" / "drivux" / "config"
+
+# Known preference keys with their defaults
+DEFAULTS = {
+    "log_max_lines": "20000",
+    "log_archive_days": "30",
+    "poll_min_seconds": "2",
+    "poll_max_seconds": "300",
+    "restart_concurrency": "2",
+}
+
+
+def get_int(key: str) -> int:
+    """Integer preference, falling back to the default on bad values."""
+    value = ConfigManager(PREFERENCES_PATH).get(key, DEFAULTS[key])
+    try:
+        return int(value)
+    except ValueError:
+        return int(DEFAULTS[key])
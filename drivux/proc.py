@@ -0,0 +1,38 @@
+"""Process statistics read from /proc."""
+
+import os
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def rss_bytes(pid: int | str = "self") -> int:
+    """Resident set size of a process, 0 if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def cpu_seconds(pid: int | str = "self") -> float:
+    """User + system CPU time consumed by a process, 0 if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the ")" closing the command name; utime and stime are 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def process_age(pid: int | str = "self") -> float:
+    """Seconds since a process started (clock tick resolution), 0 if unknown."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # starttime is field 22, in clock ticks since boot
+            started = int(f.read().rsplit(")", 1)[1].split()[19]) / CLOCK_TICKS
+        with open("/proc/uptime") as f:
+            return max(0.0, float(f.read().split()[0]) - started)
+    except (OSError, IndexError, ValueError):
+        return 0.0
@@ -0,0 +1,68 @@
+"""Fixed-capacity ring buffers."""
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO with O(1) append, popleft and random access.
+
+    Appending to a full buffer drops the oldest item. Unlike a deque,
+    indexing anywhere is O(1), which list models need for data().
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._items: list = [None] * capacity
+        self._capacity = capacity
+        self._start = 0
+        self._len = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._start + index) % self._capacity]
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self._items[(self._start + i) % self._capacity]
+
+    def to_list(self) -> list:
+        """Copy of the items, oldest first."""
+        end = self._start + self._len
+        if end <= self._capacity:
+            return self._items[self._start:end]
+        return self._items[self._start:] + self._items[:end - self._capacity]
+
+    def append(self, item) -> object | None:
+        """Add an item, returning the one dropped to make room (or None)."""
+        end = (self._start + self._len) % self._capacity
+        if self._len < self._capacity:
+            self._items[end] = item
+            self._len += 1
+            return None
+        dropped = self._items[end]
+        self._items[end] = item
+        self._start = (self._start + 1) % self._capacity
+        return dropped
+
+    def popleft(self):
+        if not self._len:
+            raise IndexError("pop from an empty ring buffer")
+        item = self._items[self._start]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % self._capacity
+        self._len -= 1
+        return item
+
+    def clear(self) -> None:
+        self._items = [None] * self._capacity
+        self._start = 0
+        self._len = 0
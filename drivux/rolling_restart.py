@@ -0,0 +1,113 @@
+"""Restart many units a few at a time, gated on each one coming back healthy."""
+
+import time
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .preferences import get_int
+from .tasks import submit
+
+if TYPE_CHECKING:
+    from .service_manager import ServiceManager
+
+HEALTH_CHECK_MS = 2000
+HEALTH_SETTLE = 10.0  # seconds a unit must stay active without errors
+HEALTH_TIMEOUT = 60.0  # seconds after its restart before a unit counts as unhealthy
+
+
+class RollingRestart(QObject):
+    """Restarts units at most `restart_concurrency` at a time.
+
+    Each restarted unit must stay active for HEALTH_SETTLE seconds
+    without new journal errors (has_recent_errors) before its slot goes
+    to the next unit, so the units do not all rescan OneDrive together.
+    Once more than a third of the finished units failed (and at least
+    two), the remaining ones are skipped. Results per unit are "done",
+    "failed" (job failed), "unhealthy" or "skipped".
+    """
+    progress = Signal(int, int)  # finished units, total
+    finished = Signal(dict)  # service name -> result
+
+    def __init__(self, service_mgr: "ServiceManager", service_names: list[str], parent=None):
+        super().__init__(parent)
+        self._service_mgr = service_mgr
+        self.service_names = list(service_names)
+        self.results: dict[str, str] = {}
+        self.aborted = False
+        self._queue = list(service_names)
+        self._running: dict[str, tuple[float, float | None]] = {}  # name -> (restarted at, active since)
+        self._concurrency = max(1, get_int("restart_concurrency"))
+
+    @property
+    def failed(self) -> list[str]:
+        return [name for name, result in self.results.items() if result in ("failed", "unhealthy")]
+
+    def start(self) -> None:
+        self._fill()
+        self._report()
+
+    def _fill(self):
+        while self._queue and not self.aborted and len(self._running) < self._concurrency:
+            name = self._queue.pop(0)
+            self._running[name] = (0.0, None)
+            batch = self._service_mgr.control("restart", [name], track=False)
+            batch.finished.connect(lambda results, name=name: self._on_restarted(name, results[name]))
+
+    def _on_restarted(self, name: str, result: str):
+        if result != "done":
+            self._finish(name, "failed")
+            return
+        self._running[name] = (time.time(), None)
+        QTimer.singleShot(HEALTH_CHECK_MS, lambda: self._check(name))
+
+    def _check(self, name: str):
+        restarted_at = self._running[name][0]
+        submit(
+            self._probe_health, name, restarted_at,
+            on_done=lambda health: self._on_health(name, *health),
+            on_error=lambda message: self._finish(name, "unhealthy"),
+        )
+
+    def _probe_health(self, name: str, restarted_at: float) -> tuple[bool, list[str]]:
+        statuses = self._service_mgr.store.statuses([name])
+        active = bool(statuses) and statuses[0].active
+        # Only errors logged since the restart count
+        errors = self._service_mgr.has_recent_errors(name, minutes=(time.time() - restarted_at) / 60)
+        return active, errors
+
+    def _on_health(self, name: str, active: bool, errors: list[str]):
+        restarted_at, active_since = self._running[name]
+        now = time.time()
+        if errors:
+            self._finish(name, "unhealthy")
+            return
+        if not active:
+            active_since = None
+        elif active_since is None:
+            active_since = now
+        if active_since is not None and now - active_since >= HEALTH_SETTLE:
+            self._finish(name, "done")
+        elif now - restarted_at >= HEALTH_TIMEOUT:
+            self._finish(name, "unhealthy")
+        else:
+            self._running[name] = (restarted_at, active_since)
+            QTimer.singleShot(HEALTH_CHECK_MS, lambda: self._check(name))
+
+    def _finish(self, name: str, result: str):
+        del self._running[name]
+        self.results[name] = result
+        failures = len(self.failed)
+        if failures >= 2 and failures * 3 > len(self.results):
+            self.aborted = True
+        if self.aborted and not self._running:
+            for skipped in self._queue:
+                self.results[skipped] = "skipped"
+            self._queue.clear()
+        self._fill()
+        self._report()
+
+    def _report(self):
+        self.progress.emit(len(self.results), len(self.service_names))
+        if len(self.results) == len(self.service_names):
+            self.finished.emit(dict(self.results))
@@ -0,0 +1,165 @@
+"""Native journal reader on top of libsystemd's sd-journal API (ctypes).
+
+Used instead of journalctl subprocesses when libsystemd can be loaded.
+"""
+
+import ctypes
+import ctypes.util
+import os
+
+SD_JOURNAL_LOCAL_ONLY = 1 << 0
+SD_JOURNAL_SYSTEM = 1 << 2
+SD_JOURNAL_CURRENT_USER = 1 << 3
+
+SD_JOURNAL_NOP = 0
+
+# Fields needed to build a JournalEntry, see journal.entry_from_fields()
+ENTRY_FIELDS = ("MESSAGE", "_SYSTEMD_USER_UNIT", "USER_UNIT",
+                "SYSLOG_IDENTIFIER", "_PID", "_HOSTNAME")
+
+# journalctl --user -u matches a unit on both of these
+UNIT_MATCH_FIELDS = ("_SYSTEMD_USER_UNIT", "USER_UNIT")
+
+_lib = None
+_libc = None
+
+
+def _load():
+    global _lib, _libc
+    if _lib is not None:
+        return _lib
+    name = ctypes.util.find_library("systemd")
+    if not name:
+        raise OSError("libsystemd not found")
+    lib = ctypes.CDLL(name, use_errno=True)
+    vp, sz, u64 = ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint64
+    signatures = {
+        "sd_journal_open": [ctypes.POINTER(vp), ctypes.c_int],
+        "sd_journal_add_match": [vp, ctypes.c_char_p, sz],
+        "sd_journal_add_disjunction": [vp],
+        "sd_journal_seek_head": [vp],
+        "sd_journal_seek_tail": [vp],
+        "sd_journal_seek_cursor": [vp, ctypes.c_char_p],
+        "sd_journal_seek_realtime_usec": [vp, u64],
+        "sd_journal_test_cursor": [vp, ctypes.c_char_p],
+        "sd_journal_next": [vp],
+        "sd_journal_previous_skip": [vp, u64],
+        "sd_journal_get_data": [vp, ctypes.c_char_p, ctypes.POINTER(vp), ctypes.POINTER(sz)],
+        "sd_journal_get_realtime_usec": [vp, ctypes.POINTER(u64)],
+        "sd_journal_get_cursor": [vp, ctypes.POINTER(vp)],
+        "sd_journal_get_fd": [vp],
+        "sd_journal_process": [vp],
+        "sd_journal_wait": [vp, u64],
+    }
+    for func, argtypes in signatures.items():
+        getattr(lib, func).argtypes = argtypes
+        getattr(lib, func).restype = ctypes.c_int
+    lib.sd_journal_close.argtypes = [vp]
+    lib.sd_journal_close.restype = None
+    libc = ctypes.CDLL(ctypes.util.find_library("c"))
+    libc.free.argtypes = [vp]
+    _lib, _libc = lib, libc
+    return lib
+
+
+def available() -> bool:
+    """Whether libsystemd can be loaded on this system."""
+    try:
+        _load()
+    except OSError:
+        return False
+    return True
+
+
+def _check(ret: int, what: str) -> int:
+    if ret < 0:
+        raise OSError(-ret, f"{what}: {os.strerror(-ret)}")
+    return ret
+
+
+class SdJournal:
+    """Reader over the journal entries of a set of services.
+
+    Not thread-safe: use one instance per thread.
+    """
+
+    def __init__(self, service_names: list[str], flags: int = SD_JOURNAL_LOCAL_ONLY | SD_JOURNAL_CURRENT_USER):
+        self._lib = _load()
+        self._j = ctypes.c_void_p()
+        _check(self._lib.sd_journal_open(ctypes.byref(self._j), flags), "sd_journal_open")
+        for name in service_names:
+            for field in UNIT_MATCH_FIELDS:
+                match = f"{field}={name}.service".encode()
+                _check(self._lib.sd_journal_add_match(self._j, match, len(match)), "sd_journal_add_match")
+                _check(self._lib.sd_journal_add_disjunction(self._j), "sd_journal_add_disjunction")
+        self._data = ctypes.c_void_p()
+        self._size = ctypes.c_size_t()
+        self._usec = ctypes.c_uint64()
+
+    def close(self) -> None:
+        if self._j:
+            self._lib.sd_journal_close(self._j)
+            self._j = ctypes.c_void_p()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def seek_tail(self, backlog: int = 0) -> None:
+        """Position so that next() returns the last `backlog` entries."""
+        _check(self._lib.sd_journal_seek_tail(self._j), "sd_journal_seek_tail")
+        # Land one entry before the oldest wanted one so next() returns it,
+        # or restart from the head when the journal is shorter than that
+        if self._lib.sd_journal_previous_skip(self._j, backlog + 1) < backlog + 1:
+            _check(self._lib.sd_journal_seek_head(self._j), "sd_journal_seek_head")
+
+    def seek_cursor(self, cursor: str) -> None:
+        """Position so that next() returns the entries after `cursor`."""
+        _check(self._lib.sd_journal_seek_cursor(self._j, cursor.encode()), "sd_journal_seek_cursor")
+        # seek_cursor positions on the entry itself, skip it if it still exists
+        if self._lib.sd_journal_next(self._j) > 0 and \
+                self._lib.sd_journal_test_cursor(self._j, cursor.encode()) <= 0:
+            self._lib.sd_journal_previous_skip(self._j, 1)
+
+    def seek_realtime(self, timestamp: float) -> None:
+        usec = int(timestamp * 1_000_000)
+        _check(self._lib.sd_journal_seek_realtime_usec(self._j, usec), "sd_journal_seek_realtime_usec")
+
+    def entries(self):
+        """Yield the fields of each following entry as a str dict."""
+        lib, j = self._lib, self._j
+        next_entry, get_data = lib.sd_journal_next, lib.sd_journal_get_data
+        get_realtime = lib.sd_journal_get_realtime_usec
+        data, size, usec = ctypes.byref(self._data), ctypes.byref(self._size), ctypes.byref(self._usec)
+        wanted = [(field, field.encode(), len(field) + 1) for field in ENTRY_FIELDS]
+        while _check(next_entry(j), "sd_journal_next") > 0:
+            fields = {}
+            for field, key, skip in wanted:
+                if get_data(j, key, data, size) >= 0:
+                    raw = ctypes.string_at(self._data.value + skip, self._size.value - skip)
+                    fields[field] = raw.decode("utf-8", errors="replace")
+            if get_realtime(j, usec) >= 0:
+                fields["__REALTIME_TIMESTAMP"] = self._usec.value
+            yield fields
+
+    def cursor(self) -> str:
+        """Cursor of the current entry, "" before the first one."""
+        out = ctypes.c_void_p()
+        if self._lib.sd_journal_get_cursor(self._j, ctypes.byref(out)) < 0:
+            return ""
+        value = ctypes.string_at(out).decode()
+        _libc.free(out)
+        return value
+
+    def fileno(self) -> int:
+        """File descriptor that becomes readable when the journal changes."""
+        return _check(self._lib.sd_journal_get_fd(self._j), "sd_journal_get_fd")
+
+    def process(self) -> int:
+        """Acknowledge a wakeup on fileno(); returns SD_JOURNAL_NOP if nothing changed."""
+        return self._lib.sd_journal_process(self._j)
+
+    def wait(self, timeout: float) -> int:
+        return self._lib.sd_journal_wait(self._j, int(timeout * 1_000_000))
@@ -1,9 +1,25 @@
 """Manage OneDrive systemd user services."""
 
-import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from .config_manager import ConfigManager
+from .error_tracker import ErrorTracker
+from .jobs import ControlBatch, JobTracker
+from .journal import JournalFollower, read_entries
+from .log_archive import LogArchive
+from .rolling_restart import RollingRestart
+from .status_store import StatusStore
+from .sync_events import SyncMonitor
+from .systemd_bus import SystemdBus
+from .tasks import run_command
+from .unit_confdir import ConfdirCache, exec_start_argvs
+
+
+# Properties fetched for every unit by the systemctl fallback probe; ExecStart
+# is only fetched again when the unit's cached confdir is out of date
+STATUS_PROPERTIES = ("Id", "Description", "ActiveState", "MainPID", "FragmentPath")
+
 
 @dataclass
 class ServiceStatus:
@@ -16,19 +32,56 @@ class ServiceStatus:
     pid: int = 0
 
 
+def parse_show_output(output: str) -> dict[str, dict[str, str]]:
+    """Split `systemctl show` output for several units into props keyed by Id."""
+    units = {}
+    for block in output.split("\n\n"):
+        props = {}
+        for line in block.splitlines():
+            if "=" in line:
+                k, v = line.split("=", 1)
+                props[k] = v
+        if "Id" in props:
+            units[props["Id"]] = props
+    return units
+
+
 class ServiceManager:
     """Wrapper around systemctl --user for onedrive services."""
 
     def __init__(self):
         self._services: list[str] = []
+        self.bus = SystemdBus()
+        self.jobs = JobTracker(self.bus)
+        self.store = StatusStore(self)
+        self._confdirs = ConfdirCache()
+        self.bus.reloaded.connect(self._confdirs.invalidate)
+        self._errors = ErrorTracker()
+        self.journal = JournalFollower()
+        self.sync = SyncMonitor()
+        self.journal.entries.connect(self._on_entries)
+        self.journal.entries.connect(self.sync.feed)
+        self.journal.running_changed.connect(self._errors.set_live)
         self.discover_services()
+        self.bus.units_changed.connect(self.store.refresh)
+        self.store.updated.connect(self.sync.update_statuses)
+        self.archive = LogArchive(self._services)
+
+    def start_monitoring(self) -> None:
+        """Subscribe to systemd, follow the journal, start polling and archiving.
+
+        Kept out of __init__ so the tray can show up first.
+        """
+        self.bus.watch(self._services)
+        self.journal.start(self._services)
+        self.store.start_polling()
+        self.archive.start()
 
     def discover_services(self) -> list[str]:
         """Find all onedrive user services."""
-        result = subprocess.run(
+        result = run_command(
             ["systemctl", "--user", "list-units", "--type=service",
-             "--all", "--no-legend", "--no-pager"],
-            capture_output=True, text=True
+             "--all", "--no-legend", "--no-pager"]
         )
         self._services = []
         for line in result.stdout.splitlines():
@@ -44,31 +97,36 @@ class ServiceManager:
 
     def get_status(self, service_name: str) -> ServiceStatus:
         """Get detailed status for a service."""
-        confdir = self._get_confdir(service_name)
-        sync_dir = ""
-        if confdir and confdir.exists():
-            config_file = confdir / "config"
-            if config_file.exists():
-                for line in config_file.read_text().splitlines():
-                    if line.strip().startswith("sync_dir"):
-                        sync_dir = line.split("=", 1)[1].strip().strip('"')
-                        break
-
-        # Get display name from unit description
-        result = subprocess.run(
-            ["systemctl", "--user", "show", f"{service_name}.service",
-             "--property=Description,ActiveState,MainPID", "--no-pager"],
-            capture_output=True, text=True
-        )
+        return self.get_all_statuses([service_name])[0]
+
+    def get_all_statuses(self, service_names: list[str] | None = None) -> list[ServiceStatus]:
+        """Get status for all discovered services (or some).
+
+        Properties are read over the user bus; units it cannot answer for
+        are probed with a single systemctl call.
+        """
+        names = self._services if service_names is None else service_names
+        if not names:
+            return []
         props = {}
-        for line in result.stdout.splitlines():
-            if "=" in line:
-                k, v = line.split("=", 1)
-                props[k] = v
+        if self.bus.available:
+            for name in names:
+                if (unit := self.bus.get_unit_properties(name)) is not None:
+                    props[name] = unit
+        missing = [name for name in names if name not in props]
+        if missing:
+            props.update(self._show_properties(missing))
+        confdirs = self._resolve_confdirs(
+            {name: props[name].get("FragmentPath", "") for name in names})
+        return [self._build_status(name, props[name], confdirs[name]) for name in names]
+
+    def _build_status(self, service_name: str, props: dict[str, str],
+                      confdir: Path | None) -> ServiceStatus:
+        sync_dir = ConfigManager(confdir / "config").get("sync_dir") if confdir else ""
 
         active = props.get("ActiveState", "") == "active"
         display_name = props.get("Description", service_name)
-        pid = int(props.get("MainPID", "0"))
+        pid = int(props.get("MainPID") or "0")
 
         return ServiceStatus(
             name=service_name,
@@ -80,65 +138,76 @@ class ServiceManager:
             pid=pid,
         )
 
-    def get_all_statuses(self) -> list[ServiceStatus]:
-        """Get status for all discovered services."""
-        return [self.get_status(s) for s in self._services]
-
-    def start(self, service_name: str) -> tuple[bool, str]:
-        return self._run_ctl("start", service_name)
-
-    def stop(self, service_name: str) -> tuple[bool, str]:
-        return self._run_ctl("stop", service_name)
-
-    def restart(self, service_name: str) -> tuple[bool, str]:
-        return self._run_ctl("restart", service_name)
-
-    def has_recent_errors(self, service_name: str, minutes: int = 10) -> list[str]:
-        """Check journalctl for recent errors."""
-        result = subprocess.run(
-            ["journalctl", "--user", "-u", f"{service_name}.service",
-             "--since", f"{minutes} minutes ago", "--no-pager", "-q"],
-            capture_output=True, text=True
-        )
-        errors = []
-        for line in result.stdout.splitlines():
-            lower = line.lower()
-            if "error" in lower or "cannot connect" in lower or "big_delete" in lower:
-                errors.append(line)
-        return errors
+    def control(self, action: str, service_names: list[str], track: bool = True) -> ControlBatch:
+        """Start, stop or restart units together without blocking.
+
+        Statuses are polled quickly while the jobs run and refreshed
+        once they are all finished.
+        """
+        self.store.expedite(service_names)
+        batch = self.jobs.submit(action, service_names, track)
+        batch.finished.connect(lambda _: self._on_control_finished(service_names))
+        return batch
+
+    def restart_rolling(self, service_names: list[str]) -> RollingRestart:
+        """Restart units a few at a time, each waiting for the previous to be healthy."""
+        return self.jobs.start(RollingRestart(self, service_names))
+
+    def _on_control_finished(self, service_names: list[str]) -> None:
+        for name in service_names:
+            self.store.invalidate(name)
+        self.store.refresh(service_names)
+
+    def has_recent_errors(self, service_name: str, minutes: float = 10) -> list[str]:
+        """Check the journal for recent errors (only reads new entries)."""
+        self._errors.update(service_name)
+        return self._errors.recent(service_name, minutes)
+
+    def _on_entries(self, entries: list) -> None:
+        # A fresh error is worth a quick status probe of its unit
+        errored = self._errors.feed(entries)
+        if errored:
+            self.store.expedite(sorted(errored))
 
     def get_logs(self, service_name: str, lines: int = 100) -> str:
         """Get recent logs for a service."""
-        result = subprocess.run(
-            ["journalctl", "--user", "-u", f"{service_name}.service",
-             "-n", str(lines), "--no-pager", "-q"],
-            capture_output=True, text=True
-        )
-        return result.stdout
-
-    def _run_ctl(self, action: str, service_name: str) -> tuple[bool, str]:
-        result = subprocess.run(
-            ["systemctl", "--user", action, f"{service_name}.service"],
-            capture_output=True, text=True
-        )
-        return result.returncode == 0, result.stderr.strip()
-
-    def _get_confdir(self, service_name: str) -> Path | None:
-        """Determine config directory for a service."""
-        # Read ExecStart from service unit to find --confdir
-        result = subprocess.run(
-            ["systemctl", "--user", "show", f"{service_name}.service",
-             "--property=ExecStart", "--no-pager"],
-            capture_output=True, text=True
+        entries, _ = read_entries([service_name], lines=lines)
+        return "".join(f"{e.line}\n" for e in entries)
+
+    def _show_properties(self, service_names: list[str]) -> dict[str, dict[str, str]]:
+        """Fallback for get_all_statuses when the user bus is unavailable."""
+        result = run_command(
+            ["systemctl", "--user", "show",
+             *[f"{s}.service" for s in service_names],
+             f"--property={','.join(STATUS_PROPERTIES)}", "--no-pager"]
         )
-        output = result.stdout
-        if "--confdir=" in output:
-            for part in output.split():
-                if part.startswith("--confdir=") or part.startswith("confdir="):
-                    path = part.split("confdir=", 1)[1].rstrip(";")
-                    return Path(path)
-        # Default fallback
-        home = Path.home()
-        if service_name == "onedrive":
-            return home / ".config" / "onedrive"
-        return home / ".config" / service_name
+        units = parse_show_output(result.stdout)
+        return {name: units.get(f"{name}.service", {}) for name in service_names}
+
+    def _resolve_confdirs(self, fragments: dict[str, str]) -> dict[str, Path]:
+        """Confdir of each unit (name -> FragmentPath), from cache, the bus or systemctl."""
+        confdirs = {}
+        for name, fragment in fragments.items():
+            if (confdir := self._confdirs.lookup(name, fragment)) is not None:
+                confdirs[name] = confdir
+        missing = [name for name in fragments if name not in confdirs]
+        if not missing:
+            return confdirs
+        generation = self._confdirs.generation
+        argvs = {}
+        if self.bus.available:
+            for name in missing:
+                if (unit_argvs := self.bus.get_exec_start(name)) is not None:
+                    argvs[name] = unit_argvs
+        unread = [name for name in missing if name not in argvs]
+        if unread:
+            result = run_command(
+                ["systemctl", "--user", "show", *[f"{s}.service" for s in unread],
+                 "--property=Id,ExecStart", "--no-pager"]
+            )
+            units = parse_show_output(result.stdout)
+            for name in unread:
+                argvs[name] = exec_start_argvs(units.get(f"{name}.service", {}).get("ExecStart", ""))
+        for name in missing:
+            confdirs[name] = self._confdirs.store(name, fragments[name], argvs[name], generation)
+        return confdirs
@@ -0,0 +1,240 @@
+"""Service table model and its row actions delegate."""
+
+import time
+from dataclasses import dataclass
+
+from PySide6.QtCore import QAbstractTableModel, QEvent, QModelIndex, QRect, Qt, Signal
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from .service_manager import ServiceStatus
+from .status_store import StatusStore
+from .sync_events import ServiceMetrics, SyncMonitor
+from .timeseries import buckets, sparkline
+from .i18n import t
+
+COLUMNS = ("service", "status", "folder", "pid", "files_per_min",
+           "last_sync", "scan_time", "activity", "actions")
+ACTIONS_COLUMN = COLUMNS.index("actions")
+ActionsRole = Qt.ItemDataRole.UserRole
+
+COLOR_ERROR = "#f38ba8"
+COLOR_OK = "#a6e3a1"
+COLOR_INACTIVE = "#f9e2af"
+COLOR_THROTTLED = "#fab387"
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min"
+    if seconds < 86400:
+        return f"{seconds // 3600} h"
+    return f"{seconds // 86400} d"
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def activity_sparkline(metrics: ServiceMetrics, now: float) -> str:
+    """Sync events over the last hour, 3 minutes per character."""
+    return sparkline(buckets(metrics.events.values(60, now), 20))
+
+
+def activity_tooltip(metrics: ServiceMetrics, now: float) -> str:
+    hour = [
+        (t("events_per_min"), metrics.events.values(60, now), sum, lambda v: f"{v:.0f}"),
+        (t("errors_per_min"), metrics.errors.values(60, now), sum, lambda v: f"{v:.0f}"),
+        (t("cpu"), metrics.cpu.values(60, now), max, lambda v: f"{v:.0f} %"),
+        (t("rss"), metrics.rss.values(60, now), max, lambda v: format_size(v)),
+    ]
+    lines = [f"{t('last_hour')}:"]
+    for label, values, reduce, fmt in hour:
+        lines.append(f"  {label}: {sparkline(buckets(values, 20, reduce))}  max {fmt(max(values))}")
+    day = buckets(metrics.events.values(24 * 60, now), 24)
+    lines.append(f"{t('last_24h')}: {sparkline(day)}")
+    return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class Cell:
+    text: str = ""
+    color: str = ""
+    tooltip: str = ""
+    actions: tuple[str, ...] = ()
+
+
+class ServiceTableModel(QAbstractTableModel):
+    """One row per service, updated by diffing status snapshots.
+
+    Cells are rendered to plain values once per snapshot; only the cells
+    whose values differ from the previous snapshot are reported changed,
+    so selection, scrolling and unchanged cells are left alone.
+    """
+
+    def __init__(self, store: StatusStore, sync: SyncMonitor, parent=None):
+        super().__init__(parent)
+        self._store = store
+        self._sync = sync
+        self._statuses: list[ServiceStatus] = []
+        self._rows: list[tuple[Cell, ...]] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return t(COLUMNS[section])
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        cell = self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return cell.text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QColor(cell.color) if cell.color else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return cell.tooltip or None
+        if role == ActionsRole:
+            return cell.actions
+        return None
+
+    def status(self, row: int) -> ServiceStatus | None:
+        return self._statuses[row] if 0 <= row < len(self._statuses) else None
+
+    def set_statuses(self, statuses: list[ServiceStatus]) -> None:
+        now = time.time()
+        rows = [self._cells(st, now) for st in statuses]
+        if [st.name for st in statuses] != [st.name for st in self._statuses]:
+            # Services appeared or went away: rare, rebuild everything
+            self.beginResetModel()
+            self._statuses, self._rows = list(statuses), rows
+            self.endResetModel()
+            return
+
+        self._statuses = list(statuses)
+        for row, (old, new) in enumerate(zip(self._rows, rows)):
+            self._rows[row] = new
+            # One dataChanged per run of consecutive changed cells
+            column = 0
+            while column < len(new):
+                if old[column] == new[column]:
+                    column += 1
+                    continue
+                first = column
+                while column < len(new) and old[column] != new[column]:
+                    column += 1
+                self.dataChanged.emit(self.index(row, first), self.index(row, column - 1))
+
+    def _cells(self, st: ServiceStatus, now: float) -> tuple[Cell, ...]:
+        if not st.active:
+            status = Cell(t("inactive"), COLOR_INACTIVE)
+        elif self._store.cached_errors(st.name):
+            status = Cell(t("error"), COLOR_ERROR)
+        else:
+            status = Cell(t("active"), COLOR_OK)
+
+        metrics = self._sync.metrics(st.name)
+        rate = f"{metrics.files_per_min(now):.1f}"
+        bytes_per_min = metrics.bytes_per_min(now)
+        if bytes_per_min is not None:
+            rate += f" ({format_size(bytes_per_min)}/min)"
+        throttled = metrics.throttled(now)
+        if throttled:
+            rate_cell = Cell(rate, COLOR_THROTTLED, f"{t('throttled')}: {throttled}")
+        else:
+            rate_cell = Cell(rate)
+
+        last_sync = t("time_ago").format(format_duration(now - metrics.last_sync)) if metrics.last_sync else "-"
+        if metrics.big_delete_blocked > metrics.last_sync:
+            last_sync_cell = Cell(last_sync, COLOR_ERROR, t("big_delete_blocked"))
+        else:
+            last_sync_cell = Cell(last_sync)
+
+        scan = metrics.last_scan_duration
+        return (
+            Cell(st.display_name or st.name),
+            status,
+            Cell(st.sync_dir),
+            Cell(str(st.pid) if st.pid else "-"),
+            rate_cell,
+            last_sync_cell,
+            Cell(format_duration(scan) if scan else "-"),
+            Cell(activity_sparkline(metrics, now), tooltip=activity_tooltip(metrics, now)),
+            Cell(actions=("restart", "stop") if st.active else ("start",)),
+        )
+
+
+class ServiceActionsDelegate(QStyledItemDelegate):
+    """Paints a row's start/stop/restart buttons and reports clicks.
+
+    Replaces a widget per row: buttons are only drawn, and clicks are
+    hit-tested against the same geometry.
+    """
+    action_triggered = Signal(str, int)  # action, row
+
+    MARGIN = 4
+    PADDING = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed: tuple[int, str] | None = None
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        for action, rect in self._buttons(option, index):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = t(action)
+            button.palette = option.palette
+            button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+            if self._pressed == (index.row(), action):
+                button.state |= QStyle.StateFlag.State_Sunken
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        widths = [self._button_width(option, action) for action in index.data(ActionsRole) or ()]
+        size.setWidth(sum(widths) + self.MARGIN * (len(widths) + 1))
+        size.setHeight(max(size.height(), option.fontMetrics.height() + 2 * self.MARGIN + 6))
+        return size
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        pos = event.position().toPoint()
+        hit = next((action for action, rect in self._buttons(option, index) if rect.contains(pos)), None)
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self._pressed = (index.row(), hit) if hit else None
+        else:
+            if hit and self._pressed == (index.row(), hit):
+                self.action_triggered.emit(hit, index.row())
+            self._pressed = None
+        if option.widget:
+            option.widget.viewport().update(option.rect)
+        return hit is not None
+
+    def _buttons(self, option, index) -> list[tuple[str, QRect]]:
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN // 2, 0, -(self.MARGIN // 2))
+        buttons = []
+        x = rect.left()
+        for action in index.data(ActionsRole) or ():
+            width = self._button_width(option, action)
+            buttons.append((action, QRect(x, rect.top(), width, rect.height())))
+            x += width + self.MARGIN
+        return buttons
+
+    def _button_width(self, option, action: str) -> int:
+        return option.fontMetrics.horizontalAdvance(t(action)) + self.PADDING
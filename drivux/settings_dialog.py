@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
 )
 
 from .config_manager import ConfigManager, CONFIG_KEYS
+from .rolling_restart import RollingRestart
 from .service_manager import ServiceManager, ServiceStatus
 from .i18n import t
 
@@ -21,7 +22,8 @@ class ServiceConfigTab(QWidget):
         super().__init__(parent)
         self._status = status
         self._config = ConfigManager(status.confdir / "config")
-        self._widgets: dict[str, QWidget] = {}
+        # One row per value, repeated keys (skip_dir...) having several
+        self._widgets: list[tuple[str, QLineEdit]] = []
         self._config_group_title = t("configuration")
         self._setup_ui()
 
@@ -42,15 +44,16 @@ class ServiceConfigTab(QWidget):
         config_group = QGroupBox(self._config_group_title)
         form = QFormLayout(config_group)
 
-        current = self._config.read()
+        current = self._config.read_all()
 
         # Show existing config values
-        for key, value in current.items():
+        for key, values in current.items():
             desc = CONFIG_KEYS.get(key, key)
-            widget = QLineEdit(value)
-            widget.setToolTip(desc)
-            form.addRow(f"{key}:", widget)
-            self._widgets[key] = widget
+            for value in values:
+                widget = QLineEdit(value)
+                widget.setToolTip(desc)
+                form.addRow(f"{key}:", widget)
+                self._widgets.append((key, widget))
 
         layout.addWidget(config_group)
 
@@ -83,17 +86,21 @@ class ServiceConfigTab(QWidget):
             if group.title() == self._config_group_title:
                 group.layout().addRow(f"{key}:", widget)
                 break
-        self._widgets[key] = widget
+        self._widgets.append((key, widget))
         self._new_key.clear()
         self._new_value.clear()
 
+    @property
+    def service_name(self) -> str:
+        return self._status.name
+
     def save(self) -> bool:
         """Save current widget values to config file."""
-        config = {}
-        for key, widget in self._widgets.items():
+        config: dict[str, list[str]] = {}
+        for key, widget in self._widgets:
             value = widget.text().strip()
             if value:
-                config[key] = value
+                config.setdefault(key, []).append(value)
         try:
             self._config.write(config)
             return True
@@ -117,7 +124,7 @@ class SettingsDialog(QDialog):
         layout = QVBoxLayout(self)
 
         self._tab_widget = QTabWidget()
-        for status in self._service_mgr.get_all_statuses():
+        for status in self._statuses():
             label = status.name.replace("onedrive-", "").replace("onedrive", t("personal"))
             tab = ServiceConfigTab(status)
             self._tab_widget.addTab(tab, label)
@@ -142,6 +149,16 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(btn_layout)
 
+    def _statuses(self) -> list[ServiceStatus]:
+        """Status of every service, probed now for those not published yet."""
+        store = self._service_mgr.store
+        known = {status.name: status for status in store.snapshot()}
+        missing = [name for name in self._service_mgr.services if name not in known]
+        if missing:
+            # Opened before the first probe published (e.g. right after launch)
+            known.update((status.name, status) for status in store.statuses(missing))
+        return [known[name] for name in self._service_mgr.services if name in known]
+
     def _save_all(self) -> bool:
         all_ok = all(tab.save() for tab in self._tabs)
         if all_ok:
@@ -152,6 +169,14 @@ class SettingsDialog(QDialog):
     def _save_and_restart(self):
         if not self._save_all():
             return
-        for status in self._service_mgr.get_all_statuses():
-            self._service_mgr.restart(status.name)
-        QMessageBox.information(self, "Drivux", t("services_restarted"))
+        names = [tab.service_name for tab in self._tabs]
+        rollout = self._service_mgr.restart_rolling(names)
+        rollout.finished.connect(lambda _: self._report_restart(rollout))
+
+    @staticmethod
+    def _report_restart(rollout: RollingRestart):
+        if rollout.failed:
+            message = t("restart_aborted") if rollout.aborted else t("restart_failed")
+            QMessageBox.warning(None, "Drivux", f"{message}: {', '.join(rollout.failed)}")
+        else:
+            QMessageBox.information(None, "Drivux", t("services_restarted"))
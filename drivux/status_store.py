@@ -0,0 +1,200 @@
+"""Shared status probes feeding the tray and the main window."""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .poll_scheduler import PollScheduler
+from .preferences import get_int
+from .tasks import Task, submit
+
+if TYPE_CHECKING:
+    from .service_manager import ServiceManager, ServiceStatus
+
+
+class StatusStore(QObject):
+    """ServiceManager probes shared by their callers, pushed to subscribers.
+
+    Probes always return fresh results, but concurrent requests share
+    them per service: a unit whose status or error check is already
+    being probed waits for that result instead of probing again.
+    refresh() probes on the thread pool; the GUI only ever reads the
+    last published snapshot and error checks.
+
+    Polling is per service: a PollScheduler decides which services are
+    due, and only those are probed and merged into the snapshot.
+    """
+    updated = Signal(list)
+
+    def __init__(self, service_mgr: "ServiceManager", parent=None):
+        super().__init__(parent)
+        self._service_mgr = service_mgr
+        self._lock = threading.Lock()
+        self._errors: dict[str, list[str]] = {}  # last error check of each service
+        self._in_flight: dict[tuple, Future] = {}  # ("status"|"errors", name) -> result
+        self._snapshot: list["ServiceStatus"] = []
+        self._statuses: dict[str, "ServiceStatus"] = {}
+        self._refresh_task: Task | None = None
+        self._pending: set[str] = set()  # requested while a probe was running
+
+        self._scheduler = PollScheduler()
+        self._polling = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._poll_due)
+
+    def start_polling(self) -> None:
+        """Poll each service when the scheduler says it is due."""
+        self._scheduler.set_bounds(get_int("poll_min_seconds"), get_int("poll_max_seconds"))
+        self._scheduler.set_services(self._service_mgr.services, time.monotonic())
+        self._polling = True
+        self._schedule()
+
+    def set_visible(self, visible: bool) -> None:
+        """Whether statuses are on screen, which caps the poll intervals lower."""
+        self._scheduler.visible = visible
+
+    def expedite(self, service_names: list[str]) -> None:
+        """Poll services quickly again, e.g. around a start/stop/restart."""
+        now = time.monotonic()
+        for name in service_names:
+            self._scheduler.expedite(name, now)
+        self._schedule()
+
+    def statuses(self, service_names: list[str] | None = None) -> list["ServiceStatus"]:
+        """Fresh statuses of some services (all by default).
+
+        Services not already being probed are probed together.
+        """
+        names = self._service_mgr.services if service_names is None else service_names
+        with self._lock:
+            waiting = {name: self._in_flight[("status", name)]
+                       for name in names if ("status", name) in self._in_flight}
+            owned = {name: Future() for name in names if name not in waiting}
+            for name, future in owned.items():
+                self._in_flight[("status", name)] = future
+
+        found = {}
+        if owned:
+            try:
+                found = {st.name: st for st in self._service_mgr.get_all_statuses(list(owned))}
+            except Exception as e:
+                self._settle(owned, exception=e)
+                raise
+            self._settle(owned, found)
+        for name, future in waiting.items():
+            found[name] = future.result()
+        return [found[name] for name in names if found.get(name) is not None]
+
+    def snapshot(self) -> list["ServiceStatus"]:
+        """Last published statuses, without probing."""
+        return list(self._snapshot)
+
+    def cached_errors(self, service_name: str) -> list[str]:
+        """Last known journal errors of a service, without probing."""
+        with self._lock:
+            return self._errors.get(service_name, [])
+
+    def errors(self, service_name: str) -> list[str]:
+        """Recent journal errors of a service."""
+        with self._lock:
+            future = self._in_flight.get(("errors", service_name))
+            owned = future is None
+            if owned:
+                future = Future()
+                self._in_flight[("errors", service_name)] = future
+        if not owned:
+            return future.result()
+
+        try:
+            errors = self._service_mgr.has_recent_errors(service_name)
+        except Exception as e:
+            self._settle({service_name: future}, exception=e, kind="errors")
+            raise
+        with self._lock:
+            self._errors[service_name] = errors
+        self._settle({service_name: future}, {service_name: errors}, kind="errors")
+        return errors
+
+    def invalidate(self, service_name: str | None = None) -> None:
+        """Forget the last error checks (of one service), e.g. after a restart."""
+        with self._lock:
+            if service_name is None:
+                self._errors.clear()
+            else:
+                self._errors.pop(service_name, None)
+
+    def refresh(self, service_names: list[str] | None = None) -> None:
+        """Probe services (all by default) in the background, then notify subscribers."""
+        names = self._service_mgr.services if service_names is None else list(service_names)
+        if self._refresh_task is not None:
+            # Results of the running probe may predate the request
+            self._pending.update(names)
+            return
+        self._refresh_task = submit(
+            self._probe, names, on_done=self._publish, on_error=self._on_probe_failed
+        )
+
+    def cancel(self) -> None:
+        self._polling = False
+        self._timer.stop()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        self._pending.clear()
+
+    def _poll_due(self):
+        names = self._scheduler.due(time.monotonic())
+        if names:
+            self.refresh(names)
+        else:
+            self._schedule()
+
+    def _schedule(self):
+        if not self._polling or self._refresh_task is not None:
+            return  # rescheduled once the running probe is done
+        due = self._scheduler.next_due()
+        if due is not None:
+            self._timer.start(max(0, int((due - time.monotonic()) * 1000)))
+
+    def _probe(self, service_names: list[str]) -> list[tuple["ServiceStatus", list[str]]]:
+        statuses = self.statuses(service_names)
+        return [(st, self.errors(st.name) if st.active else []) for st in statuses]
+
+    def _publish(self, results: list[tuple["ServiceStatus", list[str]]]):
+        now, wall = time.monotonic(), time.time()
+        sync = self._service_mgr.sync
+        self._scheduler.set_services(self._service_mgr.services, now)
+        for st, errors in results:
+            self._statuses[st.name] = st
+            fingerprint = (st.active, st.pid, errors[-1] if errors else "")
+            self._scheduler.observe(st.name, fingerprint, sync.metrics(st.name).busy(wall), now)
+        self._snapshot = [self._statuses[n] for n in self._service_mgr.services if n in self._statuses]
+        self.updated.emit(self._snapshot)
+        self._on_probe_done()
+
+    def _on_probe_failed(self, message: str):
+        self._on_probe_done()
+
+    def _on_probe_done(self):
+        self._refresh_task = None
+        if self._pending:
+            names, self._pending = list(self._pending), set()
+            self.refresh(names)
+        else:
+            self._schedule()
+
+    def _settle(self, futures: dict[str, Future], results: dict | None = None,
+                exception: Exception | None = None, kind: str = "status") -> None:
+        """Hand probe results (or its failure) to the callers waiting on them."""
+        with self._lock:
+            for name in futures:
+                del self._in_flight[(kind, name)]
+        for name, future in futures.items():
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(results.get(name))
@@ -0,0 +1,231 @@
+"""Typed sync events parsed from onedrive log lines, and per-service metrics.
+
+Recognises the messages of abraunegg/onedrive 2.4 and 2.5, e.g.
+"Downloading file: docs/a.txt ... done" or "Sync with Microsoft
+OneDrive is complete".
+"""
+
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from .classifier import get_classifier
+from .journal import JournalEntry
+from .proc import cpu_seconds, rss_bytes
+from .tasks import submit
+from .timeseries import TimeSeries
+
+if TYPE_CHECKING:
+    from .service_manager import ServiceStatus
+
+METRICS_WINDOW = 300  # seconds over which rates are averaged
+THROTTLE_WINDOW = 3600  # seconds a HTTP 429 stays reported
+
+
+class EventKind(Enum):
+    DOWNLOAD_START = "download_start"
+    DOWNLOAD_DONE = "download_done"
+    DOWNLOAD_FAILED = "download_failed"
+    UPLOAD_DONE = "upload_done"
+    UPLOAD_FAILED = "upload_failed"
+    DELETE = "delete"
+    SYNC_START = "sync_start"
+    SYNC_COMPLETE = "sync_complete"
+    THROTTLED = "throttled"
+    BIG_DELETE_BLOCKED = "big_delete_blocked"
+
+
+@dataclass(frozen=True)
+class SyncEvent:
+    kind: EventKind
+    timestamp: float
+    path: str = ""
+
+
+_TRANSFER = re.compile(
+    r"(?P<verb>Downloading|Uploading) (?:new |modified )?file:? (?P<path>.+?)"
+    r"(?: \.\.\.\s*(?P<result>done|failed)?\W*)?$"
+)
+_DELETE = re.compile(r"Deleting (?:item|file|directory)(?: from (?:Microsoft )?OneDrive)?:? (?P<path>.+)$")
+
+# Messages recognised by a fixed substring, checked in order
+_MARKERS = (
+    ("sync with microsoft onedrive is complete", EventKind.SYNC_COMPLETE),
+    ("sync with onedrive is complete", EventKind.SYNC_COMPLETE),
+    ("starting a sync with microsoft onedrive", EventKind.SYNC_START),
+    ("syncing changes from", EventKind.SYNC_START),
+    ("429", EventKind.THROTTLED),
+    ("large volume of data", EventKind.BIG_DELETE_BLOCKED),
+)
+
+
+def parse_event(message: str, timestamp: float) -> SyncEvent | None:
+    """The sync event described by a log message, None for other messages."""
+    if "loading " in message:
+        match = _TRANSFER.search(message)
+        if match:
+            download = match["verb"] == "Downloading"
+            if match["result"] == "done":
+                kind = EventKind.DOWNLOAD_DONE if download else EventKind.UPLOAD_DONE
+            elif match["result"] == "failed":
+                kind = EventKind.DOWNLOAD_FAILED if download else EventKind.UPLOAD_FAILED
+            elif download:
+                kind = EventKind.DOWNLOAD_START
+            else:
+                return None
+            return SyncEvent(kind, timestamp, match["path"])
+    if "Deleting " in message:
+        match = _DELETE.search(message)
+        if match:
+            return SyncEvent(EventKind.DELETE, timestamp, match["path"])
+    lower = message.lower()
+    for marker, kind in _MARKERS:
+        if marker in lower:
+            if kind is EventKind.THROTTLED and "too many requests" not in lower and "throttl" not in lower:
+                continue
+            return SyncEvent(kind, timestamp)
+    return None
+
+
+class ServiceMetrics:
+    """Rolling sync metrics of one service.
+
+    Besides the rates, keeps 24 h of per-minute series: sync events and
+    error lines per minute, and the CPU % and RSS of the onedrive process.
+    """
+
+    def __init__(self):
+        self._transfers: deque[float] = deque()
+        self._sizes: deque[tuple[float, int]] = deque()  # (timestamp, bytes) of known sizes
+        self._throttled: deque[float] = deque()
+        self.last_sync = 0.0
+        self.last_scan_duration = 0.0
+        self.big_delete_blocked = 0.0
+        self._scan_started = 0.0
+        self.events = TimeSeries()
+        self.errors = TimeSeries()
+        self.cpu = TimeSeries()
+        self.rss = TimeSeries()
+        self._cpu_sample: tuple[int, float, float] | None = None  # (pid, time, cpu seconds)
+
+    def add(self, event: SyncEvent) -> None:
+        kind = event.kind
+        self.events.add(event.timestamp)
+        if kind is EventKind.SYNC_COMPLETE:
+            if self._scan_started:
+                self.last_scan_duration = event.timestamp - self._scan_started
+            self._scan_started = 0.0
+            self.last_sync = event.timestamp
+            return
+        if not self._scan_started:
+            # A start marker, or any activity after a completed sync
+            self._scan_started = event.timestamp
+        if kind in (EventKind.DOWNLOAD_DONE, EventKind.UPLOAD_DONE, EventKind.DELETE):
+            self._transfers.append(event.timestamp)
+            self._prune(event.timestamp)
+        elif kind is EventKind.THROTTLED:
+            self._throttled.append(event.timestamp)
+        elif kind is EventKind.BIG_DELETE_BLOCKED:
+            self.big_delete_blocked = event.timestamp
+
+    def add_size(self, timestamp: float, size: int) -> None:
+        """Record the size of a file transferred at `timestamp`."""
+        self._sizes.append((timestamp, size))
+        self._prune(timestamp)
+
+    def sample_process(self, pid: int, now: float) -> None:
+        """Record the CPU % (since the previous sample) and RSS of the process."""
+        cpu = cpu_seconds(pid)
+        previous = self._cpu_sample
+        if previous and previous[0] == pid and now > previous[1]:
+            self.cpu.set(now, max(0.0, (cpu - previous[2]) / (now - previous[1]) * 100))
+        self._cpu_sample = (pid, now, cpu)
+        self.rss.set(now, rss_bytes(pid))
+
+    def files_per_min(self, now: float | None = None) -> float:
+        self._prune(now)
+        return len(self._transfers) * 60 / METRICS_WINDOW
+
+    def bytes_per_min(self, now: float | None = None) -> float | None:
+        """Bytes moved per minute, None when no transfer size is known."""
+        self._prune(now)
+        if not self._sizes:
+            return None
+        return sum(size for _, size in self._sizes) * 60 / METRICS_WINDOW
+
+    def busy(self, now: float) -> bool:
+        """Whether sync events were logged in the last METRICS_WINDOW."""
+        return any(self.events.values(METRICS_WINDOW // 60, now))
+
+    def throttled(self, now: float | None = None) -> int:
+        """HTTP 429 responses in the last hour."""
+        limit = (now or time.time()) - THROTTLE_WINDOW
+        while self._throttled and self._throttled[0] < limit:
+            self._throttled.popleft()
+        return len(self._throttled)
+
+    def _prune(self, now: float | None) -> None:
+        limit = (now or time.time()) - METRICS_WINDOW
+        while self._transfers and self._transfers[0] < limit:
+            self._transfers.popleft()
+        while self._sizes and self._sizes[0][0] < limit:
+            self._sizes.popleft()
+
+
+class SyncMonitor:
+    """Feeds journal entries through parse_event() into per-service metrics.
+
+    The log only names transferred files, so their sizes are read from
+    the sync directory when it is known (see update_statuses()), on the
+    thread pool, and recorded once the stat calls are done.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, ServiceMetrics] = {}
+        self._sync_dirs: dict[str, str] = {}
+
+    def update_statuses(self, statuses: list["ServiceStatus"]) -> None:
+        """Take sync directories and process samples from freshly probed statuses."""
+        self._sync_dirs = {st.name: os.path.expanduser(st.sync_dir) for st in statuses if st.sync_dir}
+        now = time.time()
+        for st in statuses:
+            if st.active and st.pid:
+                self.metrics(st.name).sample_process(st.pid, now)
+
+    def metrics(self, service_name: str) -> ServiceMetrics:
+        return self._metrics.setdefault(service_name, ServiceMetrics())
+
+    def feed(self, entries: list[JournalEntry]) -> None:
+        is_error = get_classifier().is_error
+        transferred = []  # (service, timestamp, local path)
+        for entry in entries:
+            if is_error(entry.line):
+                self.metrics(entry.service).errors.add(entry.timestamp)
+            event = parse_event(entry.message, entry.timestamp)
+            if event is None:
+                continue
+            self.metrics(entry.service).add(event)
+            root = self._sync_dirs.get(entry.service)
+            if root and event.kind in (EventKind.DOWNLOAD_DONE, EventKind.UPLOAD_DONE):
+                transferred.append((entry.service, event.timestamp, os.path.join(root, event.path)))
+        if transferred:
+            submit(_stat_sizes, transferred, on_done=self._on_sizes)
+
+    def _on_sizes(self, sizes: list[tuple[str, float, int]]) -> None:
+        for service_name, timestamp, size in sizes:
+            self.metrics(service_name).add_size(timestamp, size)
+
+
+def _stat_sizes(transferred: list[tuple[str, float, str]]) -> list[tuple[str, float, int]]:
+    """(service, timestamp, size) of each transferred file still on disk."""
+    sizes = []
+    for service_name, timestamp, path in transferred:
+        try:
+            sizes.append((service_name, timestamp, os.stat(path).st_size))
+        except OSError:
+            pass
+    return sizes
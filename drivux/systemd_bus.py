@@ -0,0 +1,193 @@
+"""Talk to systemd over the D-Bus user bus."""
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot, SLOT
+from PySide6.QtDBus import QDBusArgument, QDBusConnection, QDBusMessage
+
+SYSTEMD_SERVICE = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_IFACE = "org.freedesktop.systemd1.Manager"
+UNIT_IFACE = "org.freedesktop.systemd1.Unit"
+SERVICE_IFACE = "org.freedesktop.systemd1.Service"
+PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
+
+# Manager methods queueing a job for each control action
+JOB_METHODS = {"start": "StartUnit", "stop": "StopUnit", "restart": "RestartUnit"}
+
+# systemd emits several PropertiesChanged per transition (activating,
+# active, MainPID...), fold them into a single refresh of the changed units.
+CHANGE_DEBOUNCE_MS = 200
+
+
+def unit_object_path(service_name: str) -> str:
+    """Build the systemd object path of a service unit (bus label escaping)."""
+    escaped = []
+    for i, byte in enumerate(f"{service_name}.service".encode()):
+        ch = chr(byte)
+        if ch.isascii() and (ch.isalpha() or (ch.isdigit() and i > 0)):
+            escaped.append(ch)
+        else:
+            escaped.append(f"_{byte:02x}")
+    return f"{SYSTEMD_PATH}/unit/{''.join(escaped)}"
+
+
+def _exec_argvs(value) -> list[list[str]]:
+    """argv of each entry of an ExecStart value, a(sasbttttuii)."""
+    if not isinstance(value, QDBusArgument):
+        # Already demarshalled into lists of (path, argv, ...) entries
+        return [[str(arg) for arg in entry[1]] for entry in value or ()]
+    argvs = []
+    value.beginArray()
+    while not value.atEnd():
+        value.beginStructure()
+        value.asVariant()  # path of the binary
+        argvs.append([str(arg) for arg in value.asVariant()])
+        value.endStructure()
+    value.endArray()
+    return argvs
+
+
+class SystemdBus(QObject):
+    """Unit properties and change notifications from org.freedesktop.systemd1."""
+    units_changed = Signal(list)  # names of the units whose state changed
+    job_removed = Signal(str, str)  # job object path, result ("done", "failed"...)
+    reloaded = Signal()  # daemon-reload finished, unit definitions may differ
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._bus = QDBusConnection.sessionBus()
+        self._reachable = self._bus.isConnected()
+        self._watched: dict[str, str] = {}  # object path -> service name
+        self._jobs_watched = False
+        self._changed: set[str] = set()  # units changed since the debounce started
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(CHANGE_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit_changed)
+
+    @property
+    def available(self) -> bool:
+        return self._reachable and self._bus.isConnected()
+
+    def watch(self, service_names: list[str]) -> None:
+        """Subscribe to PropertiesChanged for each service unit."""
+        if not self.available:
+            return
+        # systemd only broadcasts unit signals while someone is subscribed
+        reply = self._call(SYSTEMD_PATH, MANAGER_IFACE, "Subscribe")
+        if reply.type() == QDBusMessage.MessageType.ErrorMessage:
+            self._reachable = False
+            return
+        if not self._jobs_watched:
+            self._jobs_watched = True
+            self._bus.connect(
+                SYSTEMD_SERVICE, SYSTEMD_PATH, MANAGER_IFACE, "JobRemoved",
+                self, SLOT("_on_job_removed(QDBusMessage)"),
+            )
+            self._bus.connect(
+                SYSTEMD_SERVICE, SYSTEMD_PATH, MANAGER_IFACE, "Reloading",
+                self, SLOT("_on_reloading(QDBusMessage)"),
+            )
+
+        for name in service_names:
+            path = unit_object_path(name)
+            if path in self._watched:
+                continue
+            self._bus.connect(
+                SYSTEMD_SERVICE, path, PROPERTIES_IFACE, "PropertiesChanged",
+                self, SLOT("_on_properties_changed(QDBusMessage)"),
+            )
+            self._watched[path] = name
+
+    def get_unit_properties(self, service_name: str) -> dict[str, str] | None:
+        """Read Description, ActiveState, MainPID and FragmentPath without forking systemctl.
+
+        Two round-trips: GetAll on the Unit interface, and MainPID alone
+        since GetAll on Service would also marshal every Exec* command.
+        Returns None when the bus is unreachable so callers can fall back.
+        """
+        if not self.available:
+            return None
+        path = unit_object_path(service_name)
+        reply = self._call(path, PROPERTIES_IFACE, "GetAll", UNIT_IFACE)
+        if reply.type() != QDBusMessage.MessageType.ReplyMessage or not reply.arguments():
+            return None
+        unit = reply.arguments()[0]
+        if not isinstance(unit, dict):
+            return None
+        reply = self._call(path, PROPERTIES_IFACE, "Get", SERVICE_IFACE, "MainPID")
+        if reply.type() != QDBusMessage.MessageType.ReplyMessage or not reply.arguments():
+            return None
+        pid = reply.arguments()[0]
+        if hasattr(pid, "variant"):
+            pid = pid.variant()
+        result = {prop: str(unit.get(prop, "")) for prop in ("Description", "ActiveState", "FragmentPath")}
+        result["MainPID"] = str(pid)
+        return result
+
+    def get_exec_start(self, service_name: str) -> list[list[str]] | None:
+        """Command lines of a unit's ExecStart, argv as systemd holds it.
+
+        Returns None when the bus is unreachable so callers can fall back
+        to parsing `systemctl show`.
+        """
+        if not self.available:
+            return None
+        reply = self._call(unit_object_path(service_name), PROPERTIES_IFACE, "Get",
+                           SERVICE_IFACE, "ExecStart")
+        if reply.type() != QDBusMessage.MessageType.ReplyMessage or not reply.arguments():
+            return None
+        value = reply.arguments()[0]
+        if hasattr(value, "variant"):
+            value = value.variant()
+        return _exec_argvs(value)
+
+    def queue_job(self, action: str, service_name: str) -> str | None:
+        """Queue a start/stop/restart job without waiting for it.
+
+        Returns the job object path, whose completion is reported by
+        job_removed, or None if systemd refused the job.
+        """
+        if not self.available:
+            return None
+        reply = self._call(SYSTEMD_PATH, MANAGER_IFACE, JOB_METHODS[action],
+                           f"{service_name}.service", "replace")
+        if reply.type() != QDBusMessage.MessageType.ReplyMessage or not reply.arguments():
+            return None
+        job = reply.arguments()[0]
+        return job.path() if hasattr(job, "path") else str(job)
+
+    def _call(self, path: str, interface: str, method: str, *args) -> QDBusMessage:
+        # Plain method calls, QDBusInterface would introspect on every use
+        message = QDBusMessage.createMethodCall(SYSTEMD_SERVICE, path, interface, method)
+        message.setArguments(list(args))
+        return self._bus.call(message)
+
+    @Slot(QDBusMessage)
+    def _on_properties_changed(self, message: QDBusMessage):
+        args = message.arguments()
+        if not args or args[0] not in (UNIT_IFACE, SERVICE_IFACE):
+            return
+        name = self._watched.get(message.path())
+        if name:
+            self._changed.add(name)
+            self._debounce.start()
+
+    def _emit_changed(self):
+        names, self._changed = sorted(self._changed), set()
+        self.units_changed.emit(names)
+
+    @Slot(QDBusMessage)
+    def _on_job_removed(self, message: QDBusMessage):
+        # JobRemoved(u id, o job, s unit, s result)
+        args = message.arguments()
+        if len(args) == 4:
+            job = args[1].path() if hasattr(args[1], "path") else str(args[1])
+            self.job_removed.emit(job, str(args[3]))
+
+    @Slot(QDBusMessage)
+    def _on_reloading(self, message: QDBusMessage):
+        # Reloading(b active): true when it starts, false once done
+        args = message.arguments()
+        if args and not args[0]:
+            self.reloaded.emit()
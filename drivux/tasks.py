@@ -0,0 +1,128 @@
+"""Run blocking work (systemctl, journalctl) off the GUI thread."""
+
+import subprocess
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+COMMAND_TIMEOUT = 15.0  # seconds before a systemctl/journalctl call is abandoned
+
+_local = threading.local()
+_active: set["Task"] = set()
+_active_lock = threading.Lock()
+
+
+class TaskSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class Task(QRunnable):
+    """A function call executed on the global QThreadPool.
+
+    Results come back through `signals` on the GUI thread. Cancelling a
+    task drops its result and kills any command it is waiting on.
+    """
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = TaskSignals()
+        self._fn = fn
+        self._args = args
+        self._lock = threading.Lock()
+        self._processes: list[subprocess.Popen] = []
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            processes = list(self._processes)
+        for proc in processes:
+            proc.kill()
+
+    def attach(self, proc: subprocess.Popen) -> None:
+        """Tie a running command to this task so cancel() can kill it."""
+        with self._lock:
+            if not self._cancelled:
+                self._processes.append(proc)
+                return
+        proc.kill()
+
+    def detach(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            if proc in self._processes:
+                self._processes.remove(proc)
+
+    def run(self):
+        try:
+            if self._cancelled:
+                return
+            _local.task = self
+            try:
+                result = self._fn(*self._args)
+            except Exception as e:
+                if not self._cancelled:
+                    self.signals.failed.emit(str(e))
+                return
+            finally:
+                _local.task = None
+            if not self._cancelled:
+                self.signals.finished.emit(result)
+        finally:
+            with _active_lock:
+                _active.discard(self)
+
+
+def current_task() -> Task | None:
+    """The task running on this thread, if any."""
+    return getattr(_local, "task", None)
+
+
+def submit(fn, *args, on_done=None, on_error=None) -> Task:
+    """Run fn(*args) on the thread pool and return the cancellable task."""
+    task = Task(fn, *args)
+    if on_done:
+        task.signals.finished.connect(on_done)
+    if on_error:
+        task.signals.failed.connect(on_error)
+    with _active_lock:
+        _active.add(task)
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+def cancel_all() -> None:
+    """Cancel every pending or running task (used on quit)."""
+    with _active_lock:
+        tasks = list(_active)
+    for task in tasks:
+        task.cancel()
+
+
+def run_command(args: list[str], timeout: float = COMMAND_TIMEOUT) -> subprocess.CompletedProcess:
+    """subprocess.run with a timeout, killed if the calling task is cancelled.
+
+    Timeouts and cancellations come back as a failed result instead of
+    raising, like any other failing command.
+    """
+    task = current_task()
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if task:
+        task.attach(proc)
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return subprocess.CompletedProcess(args, -1, "", f"{args[0]} timed out after {timeout:g}s")
+    finally:
+        if task:
+            task.detach(proc)
+    if task and task.cancelled:
+        return subprocess.CompletedProcess(args, -1, "", f"{args[0]} cancelled")
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
@@ -0,0 +1,78 @@
+"""Fixed-size per-minute time series and their sparkline rendering."""
+
+from array import array
+
+SERIES_MINUTES = 24 * 60
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+class TimeSeries:
+    """One float32 slot per minute over a fixed window, in a ring.
+
+    Memory is 4 bytes per minute whatever the activity. Slots of minutes
+    without data read as 0; values older than the window are dropped.
+    """
+
+    __slots__ = ("_values", "_minute")
+
+    def __init__(self, minutes: int = SERIES_MINUTES):
+        self._values = array("f", bytes(4 * minutes))
+        self._minute = 0  # epoch minute of the newest slot
+
+    def add(self, timestamp: float, amount: float = 1.0) -> None:
+        """Count `amount` in the minute of `timestamp`."""
+        i = self._slot(timestamp)
+        if i is not None:
+            self._values[i] += amount
+
+    def set(self, timestamp: float, value: float) -> None:
+        """Record a sampled value for the minute of `timestamp`."""
+        i = self._slot(timestamp)
+        if i is not None:
+            self._values[i] = value
+
+    def values(self, minutes: int, now: float) -> list[float]:
+        """The last `minutes` values up to `now`, oldest first."""
+        self._advance(int(now // 60))
+        size = len(self._values)
+        minutes = min(minutes, size)
+        end = self._minute % size + 1
+        start = end - minutes
+        if start >= 0:
+            return self._values[start:end].tolist()
+        return self._values[start:].tolist() + self._values[:end].tolist()
+
+    def _slot(self, timestamp: float) -> int | None:
+        minute = int(timestamp // 60)
+        self._advance(minute)
+        if minute <= self._minute - len(self._values):
+            return None  # older than the window
+        return minute % len(self._values)
+
+    def _advance(self, minute: int) -> None:
+        # Zero the slots of the minutes skipped since the newest one
+        if minute <= self._minute:
+            return
+        size = len(self._values)
+        for m in range(max(self._minute + 1, minute - size + 1), minute + 1):
+            self._values[m % size] = 0.0
+        self._minute = minute
+
+
+def buckets(values: list[float], count: int, reduce=sum) -> list[float]:
+    """Group values into at most `count` consecutive buckets (the first may be shorter)."""
+    if len(values) <= count:
+        return list(values)
+    size = -(-len(values) // count)  # ceiling division
+    # Full buckets are cut from the end, the remainder (1..size) goes first
+    first = len(values) - size * ((len(values) - 1) // size)
+    return [reduce(values[:first])] + [reduce(values[i:i + size]) for i in range(first, len(values), size)]
+
+
+def sparkline(values: list[float]) -> str:
+    """Unicode block sparkline scaled to the largest value."""
+    top = max(values, default=0.0)
+    if top <= 0:
+        return SPARK_CHARS[0] * len(values)
+    scale = (len(SPARK_CHARS) - 1) / top
+    return "".join(SPARK_CHARS[round(v * scale)] for v in values)
@@ -0,0 +1,100 @@
+"""Config directory of each onedrive unit, from its ExecStart command line."""
+
+import os
+import re
+import shlex
+import threading
+from pathlib import Path
+
+# `systemctl show` prints each ExecStart as
+# { path=/usr/bin/onedrive ; argv[]=/usr/bin/onedrive --monitor ... ; ignore_errors=no ; ... }
+_ARGV_RE = re.compile(r"argv\[\]=(.*?) ; (?:ignore_errors=|\})")
+
+
+def exec_start_argvs(exec_start: str) -> list[list[str]]:
+    """Command lines of an ExecStart property, one per ExecStart= line.
+
+    Only a fallback for when the user bus is unavailable: argv printed
+    unquoted cannot tell a space inside an argument from one between two.
+    """
+    argvs = []
+    for command in _ARGV_RE.findall(exec_start):
+        try:
+            argvs.append(shlex.split(command))
+        except ValueError:
+            # Older systemd prints argv unquoted, a stray quote is literal
+            argvs.append(command.split())
+    return argvs
+
+
+def confdir_from_argv(argv: list[str]) -> Path | None:
+    """Value of --confdir=PATH, --confdir PATH or -c PATH, if any."""
+    for i, arg in enumerate(argv[1:], 1):
+        for flag in ("--confdir", "-c"):
+            if arg == flag and i + 1 < len(argv):
+                return Path(argv[i + 1]).expanduser()
+            if arg.startswith(f"{flag}="):
+                return Path(arg.split("=", 1)[1]).expanduser()
+    return None
+
+
+def default_confdir(service_name: str) -> Path:
+    """Where onedrive looks without --confdir, by our unit naming convention."""
+    home = Path.home()
+    if service_name == "onedrive":
+        return home / ".config" / "onedrive"
+    return home / ".config" / service_name
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ConfdirCache:
+    """Confdirs parsed once per unit, kept until its definition may have changed.
+
+    An entry holds while the unit's FragmentPath and that file's mtime
+    are the same, and until invalidate() is called on daemon-reload.
+    Safe to use from the status probe threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> (fragment path, its mtime, confdir)
+        self._entries: dict[str, tuple[str, int | None, Path]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped by invalidate(), for store() to drop results of a stale read."""
+        return self._generation
+
+    def lookup(self, service_name: str, fragment_path: str) -> Path | None:
+        """Cached confdir, None if unknown or out of date."""
+        with self._lock:
+            entry = self._entries.get(service_name)
+        if entry and entry[0] == fragment_path and entry[1] == _mtime(fragment_path):
+            return entry[2]
+        return None
+
+    def store(self, service_name: str, fragment_path: str, argvs: list[list[str]],
+              generation: int) -> Path:
+        """Cache a unit's confdir from its ExecStart argvs, read while at `generation`."""
+        mtime = _mtime(fragment_path)
+        confdir = next(
+            (path for argv in argvs
+             if (path := confdir_from_argv(argv))),
+            default_confdir(service_name),
+        )
+        with self._lock:
+            if generation == self._generation:
+                self._entries[service_name] = (fragment_path, mtime, confdir)
+        return confdir
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
@@ -12,7 +12,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     package_data={
-        "drivux": ["resources/icons/*.svg"],
+        "drivux": ["resources/icons/*.svg", "resources/i18n/*.json"],
     },
     install_requires=[
         "PySide6>=6.5",